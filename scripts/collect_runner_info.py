@@ -3,48 +3,97 @@ import argparse
 import json
 import os
 import platform
+import re
+import shutil
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 
-
-def run_command(command):
+IS_LINUX = platform.system() == "Linux"
+IS_MACOS = platform.system() == "Darwin"
+ENV_KEYS = (
+    "GITHUB_REPOSITORY",
+    "GITHUB_RUN_ID",
+    "GITHUB_RUN_NUMBER",
+    "GITHUB_RUN_ATTEMPT",
+    "GITHUB_SHA",
+    "GITHUB_REF_NAME",
+    "RUNNER_NAME",
+    "RUNNER_OS",
+    "RUNNER_ARCH",
+    "RUNNER_ENVIRONMENT",
+    "ImageOS",
+    "ImageVersion",
+)
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+CGROUP_FILES = ("cpu.max", "cpuset.cpus.effective")
+KEY_VALUE_LINE = re.compile(r"^[ \t]*([^:\n]*?)[ \t]*:[ \t]*(.*?)[ \t]*$", re.MULTILINE)
+
+
+def start_command(command):
     try:
-        completed = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-        text = completed.stdout.strip()
-        if not text:
-            text = completed.stderr.strip()
-        return text
+        return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except Exception as exc:  # pragma: no cover - best effort metadata
         return f"<unavailable: {exc}>"
 
 
+def finish_command(process):
+    if isinstance(process, str):
+        return process
+    stdout, stderr = process.communicate()
+    if process.returncode:
+        return f"<unavailable: {subprocess.CalledProcessError(process.returncode, process.args)}>"
+    output = stdout.strip() or stderr.strip()
+    return output.decode("utf-8", "replace")
+
+
 def parse_lscpu(output):
-    data = {}
-    for line in output.splitlines():
-        if ":" not in line:
-            continue
-        key, value = line.split(":", 1)
-        data[key.strip()] = value.strip()
-    return data
+    return dict(KEY_VALUE_LINE.findall(output))
 
 
 def parse_meminfo(path):
-    values = {}
     try:
-        for line in Path(path).read_text().splitlines():
-            if ":" not in line:
-                continue
-            key, value = line.split(":", 1)
-            values[key.strip()] = value.strip()
+        return dict(KEY_VALUE_LINE.findall(Path(path).read_text()))
     except FileNotFoundError:
-        values["error"] = "not found"
-    return values
+        return {"error": "not found"}
+
+
+def parse_sysctl_cpu(output):
+    details = parse_lscpu(output)
+    aliases = {
+        "Model name": "machdep.cpu.brand_string",
+        "Vendor ID": "machdep.cpu.vendor",
+        "CPU(s)": "hw.ncpu",
+    }
+    for label, key in aliases.items():
+        if key in details:
+            details[label] = details[key]
+    return details
+
+
+def load_average():
+    if IS_LINUX:
+        return read_text("/proc/loadavg")
+    if hasattr(os, "getloadavg"):
+        return " ".join(f"{value:.2f}" for value in os.getloadavg())
+    return ""
+
+
+def meminfo_mb(meminfo):
+    fields = {
+        "total": "MemTotal",
+        "free": "MemFree",
+        "available": "MemAvailable",
+        "buffers": "Buffers",
+        "cached": "Cached",
+    }
+    summary = {}
+    for name, key in fields.items():
+        try:
+            summary[name] = int(meminfo[key].split()[0]) // 1024
+        except (KeyError, IndexError, ValueError):
+            continue
+    return summary
 
 
 def read_text(path):
@@ -54,49 +103,93 @@ def read_text(path):
         return "<not found>"
 
 
+def read_texts(root, names):
+    return {name: read_text(root / name) for name in names}
+
+
+def find_java_home():
+    java_home = os.environ.get("JAVA_HOME")
+    if java_home:
+        return Path(java_home)
+    java = shutil.which("java")
+    if java:
+        return Path(java).resolve().parent.parent
+    return None
+
+
+def read_java_release():
+    java_home = find_java_home()
+    if java_home is None:
+        return None
+    try:
+        content = (java_home / "release").read_text()
+    except OSError:
+        return None
+    release = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            release[key.strip()] = value.strip().strip('"')
+    if "JAVA_VERSION" not in release:
+        return None
+    return {
+        "javaVersion": release["JAVA_VERSION"],
+        "runtimeVersion": release.get("JAVA_RUNTIME_VERSION", ""),
+        "implementor": release.get("IMPLEMENTOR", ""),
+        "javaHome": str(java_home),
+    }
+
+
+def available_cpu_count():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
 def build_runner_info():
-    env_keys = [
-        "GITHUB_REPOSITORY",
-        "GITHUB_RUN_ID",
-        "GITHUB_RUN_NUMBER",
-        "GITHUB_RUN_ATTEMPT",
-        "GITHUB_SHA",
-        "GITHUB_REF_NAME",
-        "RUNNER_NAME",
-        "RUNNER_OS",
-        "RUNNER_ARCH",
-        "RUNNER_ENVIRONMENT",
-        "ImageOS",
-        "ImageVersion",
-    ]
-
-    lscpu_output = run_command(["lscpu"])
-    meminfo = parse_meminfo("/proc/meminfo")
+    java_info = read_java_release()
+    commands = {"uptime": ["uptime"], "kernel": ["uname", "-a"]}
+    if java_info is None:
+        commands["javaVersion"] = ["java", "-version"]
+    # lscpu only exists on Linux; macOS answers the same questions with a
+    # single sysctl call.
+    if IS_LINUX:
+        commands["lscpu"] = ["lscpu"]
+    elif IS_MACOS:
+        commands["sysctl"] = ["sysctl", "hw", "machdep.cpu"]
+    # The commands run as concurrent child processes while the procfs reads happen here.
+    processes = {name: start_command(command) for name, command in commands.items()}
+    meminfo = parse_meminfo("/proc/meminfo") if IS_LINUX else {}
+    outputs = {name: finish_command(process) for name, process in processes.items()}
+
+    cpu = {
+        "nproc": str(available_cpu_count() or ""),
+        "cpuCountTotal": os.cpu_count(),
+        "details": {},
+    }
+    if "lscpu" in outputs:
+        cpu["details"] = parse_lscpu(outputs["lscpu"])
+        cpu["rawLscpu"] = outputs["lscpu"]
+    elif "sysctl" in outputs:
+        cpu["details"] = parse_sysctl_cpu(outputs["sysctl"])
 
     return {
-        "capturedAtUtc": datetime.now(timezone.utc).isoformat(),
-        "environment": {k: os.environ.get(k, "") for k in env_keys},
+        "capturedAtUtc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {k: v for k in ENV_KEYS if (v := os.environ.get(k))},
         "system": {
             "platform": platform.platform(),
             "pythonVersion": platform.python_version(),
-            "kernel": run_command(["uname", "-a"]),
-            "uptime": run_command(["uptime"]),
-            "loadAverage": run_command(["cat", "/proc/loadavg"]),
-        },
-        "cpu": {
-            "nproc": run_command(["nproc"]),
-            "details": parse_lscpu(lscpu_output),
-            "rawLscpu": lscpu_output,
-            "cgroupCpuMax": read_text("/sys/fs/cgroup/cpu.max"),
-            "cgroupCpuset": read_text("/sys/fs/cgroup/cpuset.cpus.effective"),
+            "kernel": outputs["kernel"],
+            "uptime": outputs["uptime"],
+            "loadAverage": load_average(),
         },
+        "cpu": cpu,
+        "cgroup": read_texts(CGROUP_ROOT, CGROUP_FILES) if IS_LINUX else {},
         "memory": {
-            "freeMb": run_command(["free", "-m"]),
+            "freeMb": meminfo_mb(meminfo),
             "meminfo": meminfo,
         },
-        "java": {
-            "javaVersion": run_command(["java", "-version"]),
-        },
+        "java": java_info or {"javaVersion": outputs["javaVersion"]},
     }
 
 
@@ -107,7 +200,9 @@ def main():
 
     output = Path(args.output)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(build_runner_info(), indent=2, sort_keys=True) + "\n")
+    with output.open("w") as handle:
+        json.dump(build_runner_info(), handle, indent=2, sort_keys=True)
+        handle.write("\n")
 
 
 if __name__ == "__main__":
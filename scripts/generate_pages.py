@@ -1,17 +1,52 @@
 #!/usr/bin/env python3
 import argparse
+import bisect
+import collections
+import concurrent.futures
+import functools
+import gzip
+import io
 import json
 import math
+import os
 import re
-import statistics
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import escape
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
-
-
-@dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Cached escaping for the small, heavily repeated label domain (versions, units, benchmark names).
+escape_label = functools.lru_cache(maxsize=4096)(escape)
+
+SLUG_PATTERN = re.compile(r"[^a-zA-Z0-9]+")
+
+NUMERIC_FORMATS = {2: "{:.2f}".format, 4: "{:.4f}".format}
+PARALLEL_PAGE_MIN_COUNT = 4
+CHART_MAX_POINTS = 300
+CHART_COLORS = ("#0f8b8d", "#c23b4f", "#2a63d4", "#ef8354", "#1f7a8c", "#4f5d75")
+
+SUMMARY_ROW_CELLS = (
+    "<td>{version}</td>"
+    "<td>{winner_badge}</td>"
+    "<td>{latest_score}</td>"
+    "<td>{latest_score_error}</td>"
+    "<td>{score_unit}</td>"
+    "<td>{delta_vs_previous}</td>"
+    "<td>{delta_from_best}</td>"
+    "<td>{best_band}</td>"
+    "<td>{mean_last8}</td>"
+    "<td>{stdev_last8}</td>"
+    "<td>{cv_last8}</td>"
+    "<td>{samples}</td>"
+    "<td>{threads}</td>"
+    "<td>{forks}</td>"
+    "<td>{measurement_iterations}</td>"
+    "<td>{measurement_time}</td>"
+)
+
+
+@dataclass(frozen=True)
 class Record:
     run_id: str
     run_timestamp: str
@@ -26,8 +61,25 @@ class Record:
     measurement_time: Optional[str]
 
 
+@dataclass(frozen=True)
+class PageContext:
+    repo: str
+    latest_run_id: Optional[str]
+    meta: dict
+    runner: dict
+    active_run_id: Optional[str]
+    root_rel: str
+
+
+@dataclass(frozen=True)
+class PageBody:
+    tabs_html: str
+    overview_html: str
+    chart_data_json: str
+
+
 def read_json(path: Path):
-    return json.loads(path.read_text())
+    return json.loads(path.read_bytes())
 
 
 def parse_jmh_result(path: Path, run_id: str, run_timestamp: str, version: str) -> List[Record]:
@@ -38,35 +90,35 @@ def parse_jmh_result(path: Path, run_id: str, run_timestamp: str, version: str)
     records: List[Record] = []
     for item in data:
         try:
-            metric = item.get("primaryMetric", {})
-            score = float(metric["score"])
-            score_error_raw = metric.get("scoreError")
-            score_error = float(score_error_raw) if score_error_raw not in (None, "NaN") else None
+            get = item.get
+            metric = item["primaryMetric"]
+            score_error = metric.get("scoreError")
             records.append(
                 Record(
-                    run_id=run_id,
-                    run_timestamp=run_timestamp,
-                    version=version,
-                    benchmark=item.get("benchmark", "<unknown>"),
-                    score=score,
-                    score_error=score_error,
-                    score_unit=metric.get("scoreUnit", ""),
-                    threads=item.get("threads"),
-                    forks=item.get("forks"),
-                    measurement_iterations=item.get("measurementIterations"),
-                    measurement_time=item.get("measurementTime"),
+                    run_id,
+                    run_timestamp,
+                    version,
+                    get("benchmark", "<unknown>"),
+                    float(metric["score"]),
+                    None if score_error in (None, "NaN") else float(score_error),
+                    metric.get("scoreUnit", ""),
+                    get("threads"),
+                    get("forks"),
+                    get("measurementIterations"),
+                    get("measurementTime"),
                 )
             )
-        except Exception:
+        except (AttributeError, KeyError, TypeError, ValueError):
             continue
     return records
 
 
 def safe_float(value: Optional[float], digits: int = 4) -> str:
-    if value is None:
-        return ""
-    if math.isnan(value) or math.isinf(value):
+    if value is None or not math.isfinite(value):
         return ""
+    formatter = NUMERIC_FORMATS.get(digits)
+    if formatter is not None:
+        return formatter(value)
     return f"{value:.{digits}f}"
 
 
@@ -74,21 +126,28 @@ def sort_key(record: Record):
     return record.run_timestamp, record.run_id
 
 
-def load_records(history_root: Path) -> Tuple[List[Record], Dict[str, dict], Dict[str, dict]]:
+def read_optional_json(path: Path):
+    try:
+        return read_json(path)
+    except FileNotFoundError:
+        return {}
+
+
+def load_records(
+    history_root: Path,
+) -> Tuple[List[Record], Dict[str, List[Record]], Dict[str, dict], Dict[str, dict]]:
     records: List[Record] = []
+    records_by_run: Dict[str, List[Record]] = {}
     run_metadata: Dict[str, dict] = {}
     run_runner: Dict[str, dict] = {}
 
     if not history_root.exists():
-        return records, run_metadata, run_runner
+        return records, records_by_run, run_metadata, run_runner
 
     for run_dir in sorted([path for path in history_root.iterdir() if path.is_dir()]):
         run_id = run_dir.name
-        metadata_path = run_dir / "run-metadata.json"
-        runner_path = run_dir / "runner-info.json"
-
-        metadata = read_json(metadata_path) if metadata_path.exists() else {}
-        runner = read_json(runner_path) if runner_path.exists() else {}
+        metadata = read_optional_json(run_dir / "run-metadata.json")
+        runner = read_optional_json(run_dir / "runner-info.json")
         run_metadata[run_id] = metadata
         run_runner[run_id] = runner
 
@@ -97,67 +156,79 @@ def load_records(history_root: Path) -> Tuple[List[Record], Dict[str, dict], Dic
         if not results_dir.exists():
             continue
 
+        run_records = records_by_run[run_id] = []
         for result_file in sorted(results_dir.glob("*.json")):
-            version = result_file.stem
-            records.extend(parse_jmh_result(result_file, run_id, run_timestamp, version))
-
-    return records, run_metadata, run_runner
-
-
-def summarize(records: Iterable[Record]):
-    grouped: Dict[Tuple[str, str], List[Record]] = {}
-    for record in records:
-        grouped.setdefault((record.version, record.benchmark), []).append(record)
-
-    summary_rows = []
-    for _, values in grouped.items():
-        values.sort(key=sort_key)
-        latest = values[-1]
-        previous = values[-2] if len(values) > 1 else None
-        delta_percent = None
-        if previous and previous.score != 0:
-            delta_percent = ((latest.score / previous.score) - 1.0) * 100.0
-
-        sample = [value.score for value in values[-8:]]
-        mean_score = statistics.fmean(sample)
-        stdev_score = statistics.stdev(sample) if len(sample) >= 2 else None
-        cv_percent = (stdev_score / mean_score * 100.0) if stdev_score is not None and mean_score else None
-
-        summary_rows.append(
+            run_records.extend(parse_jmh_result(result_file, run_id, run_timestamp, result_file.stem))
+        records.extend(run_records)
+
+    # Sorting once here keeps every grouped sublist downstream in run order. The
+    # sort key is constant within a run, so the per-run buckets need no sorting.
+    records.sort(key=sort_key)
+    return records, records_by_run, run_metadata, run_runner
+
+
+def window_stats(sample: Iterable[float]) -> Tuple[float, Optional[float]]:
+    # Welford's online update: one pass, numerically stable mean and M2.
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in sample:
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    if count < 2:
+        return mean, None
+    return mean, math.sqrt(m2 / (count - 1))
+
+
+def summary_row(values: List[Record], include_history: bool = True) -> dict:
+    latest = values[-1]
+    previous = values[-2] if len(values) > 1 else None
+    delta_percent = None
+    if previous and previous.score != 0:
+        delta_percent = ((latest.score / previous.score) - 1.0) * 100.0
+
+    mean_score, stdev_score = window_stats(value.score for value in values[-8:])
+    cv_percent = (stdev_score / mean_score * 100.0) if stdev_score is not None and mean_score else None
+
+    row = {
+        "version": latest.version,
+        "benchmark": latest.benchmark,
+        "latestRun": latest.run_id,
+        "latestTimestamp": latest.run_timestamp,
+        "latestScore": latest.score,
+        "latestScoreError": latest.score_error,
+        "scoreUnit": latest.score_unit,
+        "deltaVsPreviousPercent": delta_percent,
+        "meanLast8": mean_score,
+        "stdevLast8": stdev_score,
+        "cvLast8Percent": cv_percent,
+        "samples": len(values),
+        "threads": latest.threads,
+        "forks": latest.forks,
+        "measurementIterations": latest.measurement_iterations,
+        "measurementTime": latest.measurement_time,
+    }
+    if include_history:
+        row["history"] = [
             {
-                "version": latest.version,
-                "benchmark": latest.benchmark,
-                "latestRun": latest.run_id,
-                "latestTimestamp": latest.run_timestamp,
-                "latestScore": latest.score,
-                "latestScoreError": latest.score_error,
-                "scoreUnit": latest.score_unit,
-                "deltaVsPreviousPercent": delta_percent,
-                "meanLast8": mean_score,
-                "stdevLast8": stdev_score,
-                "cvLast8Percent": cv_percent,
-                "samples": len(values),
-                "threads": latest.threads,
-                "forks": latest.forks,
-                "measurementIterations": latest.measurement_iterations,
-                "measurementTime": latest.measurement_time,
-                "history": [
-                    {
-                        "runId": value.run_id,
-                        "runTimestamp": value.run_timestamp,
-                        "score": value.score,
-                        "scoreError": value.score_error,
-                    }
-                    for value in values
-                ],
+                "runId": value.run_id,
+                "runTimestamp": value.run_timestamp,
+                "score": value.score,
+                "scoreError": value.score_error,
             }
-        )
+            for value in values
+        ]
+    return row
+
 
+def rank_summary_rows(summary_rows: List[dict]) -> List[dict]:
     summary_rows.sort(key=lambda row: (row["benchmark"], row["version"]))
 
-    benchmark_groups: Dict[str, List[dict]] = {}
+    benchmark_groups: Dict[str, List[dict]] = collections.defaultdict(list)
     for row in summary_rows:
-        benchmark_groups.setdefault(row["benchmark"], []).append(row)
+        benchmark_groups[row["benchmark"]].append(row)
 
     def relative_error_percent(score: float, score_error: Optional[float]) -> Optional[float]:
         if score_error is None or score == 0:
@@ -165,14 +236,14 @@ def summarize(records: Iterable[Record]):
         return abs(score_error / score) * 100.0
 
     def uncertainty_percent(row: dict) -> float:
-        candidates = [2.0]  # minimum uncertainty floor
-        cv = row.get("cvLast8Percent")
-        rel_err = relative_error_percent(row.get("latestScore", 0.0), row.get("latestScoreError"))
-        if cv is not None and math.isfinite(cv):
-            candidates.append(abs(cv))
-        if rel_err is not None and math.isfinite(rel_err):
-            candidates.append(abs(rel_err))
-        return min(max(candidates), 20.0)
+        # Missing or non-finite inputs become 0.0, which never beats the 2.0 floor.
+        cv = row.get("cvLast8Percent") or 0.0
+        if not math.isfinite(cv):
+            cv = 0.0
+        rel_err = relative_error_percent(row.get("latestScore", 0.0), row.get("latestScoreError")) or 0.0
+        if not math.isfinite(rel_err):
+            rel_err = 0.0
+        return min(max(2.0, abs(cv), abs(rel_err)), 20.0)
 
     for benchmark_rows in benchmark_groups.values():
         best_row = max(benchmark_rows, key=lambda item: item["latestScore"])
@@ -195,18 +266,56 @@ def summarize(records: Iterable[Record]):
     return summary_rows
 
 
+def summarize(records: Iterable[Record]):
+    grouped: Dict[Tuple[str, str], List[Record]] = collections.defaultdict(list)
+    for record in records:
+        grouped[(record.version, record.benchmark)].append(record)
+
+    return rank_summary_rows([summary_row(values) for values in grouped.values()])
+
+
+def iter_snapshots(
+    records_by_run: Dict[str, List[Record]],
+    run_order: List[str],
+) -> Iterator[Tuple[str, List[dict]]]:
+    # Fold runs in one at a time and only re-summarize the groups a run touched,
+    # instead of re-summarizing the whole prefix of history for every snapshot.
+    # Each group keeps a parallel list of sort keys so records can be placed with bisect.
+    grouped: Dict[Tuple[str, str], List[Record]] = collections.defaultdict(list)
+    grouped_keys: Dict[Tuple[str, str], list] = collections.defaultdict(list)
+    rows_by_group: Dict[Tuple[str, str], dict] = {}
+    for run_id in run_order:
+        touched = set()
+        for record in records_by_run.get(run_id, []):
+            key = (record.version, record.benchmark)
+            record_key = sort_key(record)
+            position = bisect.bisect_right(grouped_keys[key], record_key)
+            grouped_keys[key].insert(position, record_key)
+            grouped[key].insert(position, record)
+            touched.add(key)
+        for key in touched:
+            rows_by_group[key] = summary_row(grouped[key], include_history=False)
+        # Ranking annotates rows in place, so each snapshot gets its own copies.
+        yield run_id, rank_summary_rows([dict(row) for row in rows_by_group.values()])
+
+
+# Run timestamps are bounded by the number of runs, so these caches are unbounded and
+# skip the LRU bookkeeping.
+@functools.lru_cache(maxsize=None)
 def compact_timestamp(value: str) -> str:
     if len(value) >= 16 and "T" in value:
         return value[5:16].replace("T", " ")
     return value
 
 
+@functools.lru_cache(maxsize=None)
 def compact_sidebar_timestamp(value: str) -> str:
     if len(value) >= 10:
         return value[:10]
     return value
 
 
+@functools.lru_cache(maxsize=None)
 def display_timestamp(value: str) -> str:
     try:
         normalized = value.replace("Z", "+00:00")
@@ -219,47 +328,58 @@ def display_timestamp(value: str) -> str:
 
 
 def build_chart_data_map(records: List[Record]) -> Dict[str, dict]:
-    grouped: Dict[str, List[Record]] = {}
+    grouped: Dict[str, List[Record]] = collections.defaultdict(list)
     for record in records:
-        grouped.setdefault(record.benchmark, []).append(record)
+        grouped[record.benchmark].append(record)
 
-    colors = ["#0f8b8d", "#c23b4f", "#2a63d4", "#ef8354", "#1f7a8c", "#4f5d75"]
     chart_data: Dict[str, dict] = {}
 
+    # Most runs appear in every benchmark, so order them and build their axis entries
+    # once; benchmarks share the entry dicts and only filter when runs are missing.
+    all_runs = sorted({(record.run_id, record.run_timestamp) for record in records}, key=lambda item: (item[1], item[0]))
+    run_entries = {
+        run_id: {
+            "runId": run_id,
+            "label": compact_timestamp(run_timestamp),
+            "fullLabel": display_timestamp(run_timestamp),
+        }
+        for run_id, run_timestamp in all_runs
+    }
+
     for benchmark in sorted(grouped.keys()):
         values = grouped[benchmark]
-        values.sort(key=sort_key)
 
-        unique_runs = sorted({(record.run_id, record.run_timestamp) for record in values}, key=lambda item: (item[1], item[0]))
+        present_run_ids = {record.run_id for record in values}
+        if len(present_run_ids) == len(all_runs):
+            unique_runs = all_runs
+        else:
+            unique_runs = [run for run in all_runs if run[0] in present_run_ids]
         run_index = {run_id: idx for idx, (run_id, _) in enumerate(unique_runs)}
 
-        versions = sorted({record.version for record in values})
+        by_version: Dict[str, List[Record]] = collections.defaultdict(list)
+        for record in values:
+            by_version[record.version].append(record)
+
+        versions = sorted(by_version.keys())
         score_unit = values[0].score_unit if values else ""
         series = []
 
         for version_index, version in enumerate(versions):
             line_values: List[Optional[float]] = [None] * len(unique_runs)
-            for record in [item for item in values if item.version == version]:
+            for record in by_version[version]:
                 line_values[run_index[record.run_id]] = record.score
             series.append(
                 {
                     "label": version,
                     "values": line_values,
-                    "color": colors[version_index % len(colors)],
+                    "color": CHART_COLORS[version_index % len(CHART_COLORS)],
                 }
             )
 
         chart_data[benchmark] = {
             "benchmark": benchmark,
             "scoreUnit": score_unit,
-            "runs": [
-                {
-                    "runId": run_id,
-                    "label": compact_timestamp(run_timestamp),
-                    "fullLabel": display_timestamp(run_timestamp),
-                }
-                for run_id, run_timestamp in unique_runs
-            ],
+            "runs": [run_entries[run_id] for run_id, _ in unique_runs],
             "series": [
                 {
                     "name": item["label"],
@@ -273,16 +393,136 @@ def build_chart_data_map(records: List[Record]) -> Dict[str, dict]:
     return chart_data
 
 
-def select_latest_run_id(run_metadata: Dict[str, dict]) -> Optional[str]:
-    if not run_metadata:
-        return None
-    return max(
-        run_metadata.keys(),
-        key=lambda run_id: (
-            run_metadata.get(run_id, {}).get("runTimestampUtc", ""),
-            run_id,
-        ),
-    )
+def slice_chart_data(
+    full_map: Dict[str, dict],
+    run_position: Dict[str, int],
+    upto_position: int,
+    spec_cache: Dict[str, Tuple[int, dict]],
+) -> Dict[str, dict]:
+    # Restrict the full chart data to the runs of a snapshot. Versions without a
+    # point in the snapshot are dropped and the remaining lines recoloured, which
+    # matches what build_chart_data_map would produce for the same records.
+    sliced: Dict[str, dict] = {}
+    for benchmark, spec in full_map.items():
+        keep = [idx for idx, run in enumerate(spec["runs"]) if run_position[run["runId"]] <= upto_position]
+        if not keep:
+            continue
+        if len(keep) == len(spec["runs"]):
+            sliced[benchmark] = spec
+            continue
+        # Snapshots only ever add runs, so a benchmark's slice is fully determined by
+        # how many of its runs it keeps; consecutive snapshots that did not touch the
+        # benchmark share one spec object. Only the latest slice per benchmark is kept.
+        cached = spec_cache.get(benchmark)
+        if cached is not None and cached[0] == len(keep):
+            sliced[benchmark] = cached[1]
+            continue
+        series = []
+        for item in spec["series"]:
+            data = [item["data"][idx] for idx in keep]
+            if all(value is None for value in data):
+                continue
+            series.append(
+                {
+                    "name": item["name"],
+                    "data": data,
+                    "color": CHART_COLORS[len(series) % len(CHART_COLORS)],
+                }
+            )
+        sliced[benchmark] = {
+            "benchmark": spec["benchmark"],
+            "scoreUnit": spec["scoreUnit"],
+            "runs": [spec["runs"][idx] for idx in keep],
+            "series": series,
+        }
+        spec_cache[benchmark] = (len(keep), sliced[benchmark])
+    return sliced
+
+
+def downsample_lttb(points: List[Tuple[float, float]], threshold: int) -> List[int]:
+    # Largest-Triangle-Three-Buckets: keep the first and last points and, from each
+    # bucket in between, the point spanning the largest triangle with the previously
+    # kept point and the average of the next bucket. Returns the kept indices.
+    count = len(points)
+    if threshold < 3 or count <= threshold:
+        return list(range(count))
+
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+    for bucket in range(threshold - 2):
+        avg_start = int((bucket + 1) * every) + 1
+        avg_end = min(int((bucket + 2) * every) + 1, count)
+        avg_x = math.fsum(x for x, _ in points[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = math.fsum(y for _, y in points[avg_start:avg_end]) / (avg_end - avg_start)
+
+        anchor_x, anchor_y = points[anchor]
+        best_area = -1.0
+        best_index = range_start = int(bucket * every) + 1
+        for index in range(range_start, avg_start):
+            x, y = points[index]
+            area = abs((anchor_x - avg_x) * (y - anchor_y) - (anchor_x - x) * (avg_y - anchor_y))
+            if area > best_area:
+                best_area = area
+                best_index = index
+        selected.append(best_index)
+        anchor = best_index
+    selected.append(count - 1)
+    return selected
+
+
+def downsample_chart_data(chart_data_map: Dict[str, dict]) -> Dict[str, dict]:
+    # Long histories are thinned before they are inlined. Series share the run axis, so
+    # one index set is chosen for all of them: LTTB runs over the per-run mean of the
+    # series, each scaled by its own mean so no single version dominates the shape.
+    downsampled: Dict[str, dict] = {}
+    for benchmark, spec in chart_data_map.items():
+        if len(spec["runs"]) <= CHART_MAX_POINTS:
+            downsampled[benchmark] = spec
+            continue
+        totals = [0.0] * len(spec["runs"])
+        counts = [0] * len(spec["runs"])
+        for item in spec["series"]:
+            present = [value for value in item["data"] if value is not None]
+            scale = math.fsum(present) / len(present) if present else 0.0
+            scale = scale or 1.0
+            for idx, value in enumerate(item["data"]):
+                if value is not None:
+                    totals[idx] += value / scale
+                    counts[idx] += 1
+        points = [(idx, totals[idx] / count) for idx, count in enumerate(counts) if count]
+        kept = [points[idx][0] for idx in downsample_lttb(points, CHART_MAX_POINTS)]
+        downsampled[benchmark] = {
+            **spec,
+            "runs": [spec["runs"][idx] for idx in kept],
+            "series": [{**item, "data": [item["data"][idx] for idx in kept]} for item in spec["series"]],
+        }
+    return downsampled
+
+
+def pack_chart_data(chart_data_map: Dict[str, dict]) -> dict:
+    # Most benchmarks chart the same runs, so run labels are emitted once in a shared
+    # table. Charts refer to it by index, or omit the references when they span it all.
+    run_table: List[dict] = []
+    run_refs: Dict[str, int] = {}
+    chart_refs: Dict[str, List[int]] = {}
+    for benchmark, spec in chart_data_map.items():
+        refs = chart_refs[benchmark] = []
+        for run in spec["runs"]:
+            ref = run_refs.get(run["runId"])
+            if ref is None:
+                ref = run_refs[run["runId"]] = len(run_table)
+                run_table.append({"label": run["label"], "fullLabel": run["fullLabel"]})
+            refs.append(ref)
+
+    all_refs = list(range(len(run_table)))
+    charts: Dict[str, dict] = {}
+    for benchmark, spec in chart_data_map.items():
+        chart = {"scoreUnit": spec["scoreUnit"], "series": spec["series"]}
+        if chart_refs[benchmark] != all_refs:
+            chart["runRefs"] = chart_refs[benchmark]
+        charts[benchmark] = chart
+    return {"runs": run_table, "charts": charts}
 
 
 def sorted_run_ids(run_metadata: Dict[str, dict]) -> List[str]:
@@ -292,6 +532,7 @@ def sorted_run_ids(run_metadata: Dict[str, dict]) -> List[str]:
     )
 
 
+@functools.lru_cache(maxsize=4096)
 def benchmark_group_label(benchmark: str) -> str:
     short = benchmark.split(".")[-1]
     mapping = [
@@ -334,7 +575,7 @@ def table_header(include_benchmark: bool) -> str:
     return "<tr>" + "".join(cells) + "</tr>"
 
 
-def render_summary_row(row: dict, include_benchmark: bool) -> str:
+def render_summary_row(row: dict) -> Tuple[str, str]:
     winner_badge = ""
     row_class = ""
     if row.get("strictBest"):
@@ -343,121 +584,128 @@ def render_summary_row(row: dict, include_benchmark: bool) -> str:
     elif row.get("coBest"):
         winner_badge = "<span class='cobest-badge' title='Within CV/error uncertainty band of the best score'>Near best</span>"
         row_class = "cobest-row"
-    cells = []
-    if include_benchmark:
-        cells.append(f"<td>{escape(row['benchmark'])}</td>")
-    cells.extend(
-        [
-            f"<td>{escape(row['version'])}</td>",
-            f"<td>{winner_badge}</td>",
-            f"<td>{safe_float(row['latestScore'])}</td>",
-            f"<td>{safe_float(row['latestScoreError'])}</td>",
-            f"<td>{escape(row['scoreUnit'])}</td>",
-            f"<td>{safe_float(row['deltaVsPreviousPercent'], 2)}</td>",
-            f"<td>{safe_float(row.get('deltaFromBestPercent'), 2)}</td>",
-            f"<td>{safe_float(row.get('bestBandPercent'), 2)}</td>",
-            f"<td>{safe_float(row['meanLast8'])}</td>",
-            f"<td>{safe_float(row['stdevLast8'])}</td>",
-            f"<td>{safe_float(row['cvLast8Percent'], 2)}</td>",
-            f"<td>{row['samples']}</td>",
-            f"<td>{row['threads'] if row['threads'] is not None else ''}</td>",
-            f"<td>{row['forks'] if row['forks'] is not None else ''}</td>",
-            f"<td>{row['measurementIterations'] if row['measurementIterations'] is not None else ''}</td>",
-            f"<td>{escape(row['measurementTime'] or '')}</td>",
-        ]
+    # The overview and the benchmark tabs share every cell except the leading
+    # benchmark column, so the cells are formatted once for both variants.
+    cells = SUMMARY_ROW_CELLS.format_map(
+        {
+            "version": escape_label(row["version"]),
+            "winner_badge": winner_badge,
+            "latest_score": safe_float(row["latestScore"]),
+            "latest_score_error": safe_float(row["latestScoreError"]),
+            "score_unit": escape_label(row["scoreUnit"]),
+            "delta_vs_previous": safe_float(row["deltaVsPreviousPercent"], 2),
+            "delta_from_best": safe_float(row.get("deltaFromBestPercent"), 2),
+            "best_band": safe_float(row.get("bestBandPercent"), 2),
+            "mean_last8": safe_float(row["meanLast8"]),
+            "stdev_last8": safe_float(row["stdevLast8"]),
+            "cv_last8": safe_float(row["cvLast8Percent"], 2),
+            "samples": row["samples"],
+            "threads": row["threads"] if row["threads"] is not None else "",
+            "forks": row["forks"] if row["forks"] is not None else "",
+            "measurement_iterations": row["measurementIterations"] if row["measurementIterations"] is not None else "",
+            "measurement_time": escape_label(row["measurementTime"] or ""),
+        }
+    )
+    opening = f"<tr class='{row_class}'>"
+    return (
+        f"{opening}<td>{escape_label(row['benchmark'])}</td>{cells}</tr>",
+        f"{opening}{cells}</tr>",
     )
-    return "<tr class='" + row_class + "'>" + "".join(cells) + "</tr>"
 
 
-def render_overview_table(rows: List[dict]) -> str:
+def render_overview_table(rows: List[dict], rendered_rows: List[Tuple[str, str]]) -> str:
     if not rows:
         return "<p>No benchmark rows yet.</p>"
 
-    body_rows: List[str] = []
+    out = io.StringIO()
+    out.write("<div class='summary-wrap overview-wrap'><table><thead>")
+    out.write(table_header(include_benchmark=True))
+    out.write("</thead><tbody>")
     previous_benchmark = None
-    for row in rows:
+    for index, row in enumerate(rows):
+        if index:
+            out.write("\n")
         benchmark = row["benchmark"]
         if benchmark != previous_benchmark:
-            body_rows.append(
-                "<tr class='overview-divider'>"
-                + f"<td colspan='17'>{escape(benchmark_group_label(benchmark))}: {escape(benchmark)}</td>"
-                + "</tr>"
-            )
+            out.write("<tr class='overview-divider'><td colspan='17'>")
+            out.write(escape_label(benchmark_group_label(benchmark)))
+            out.write(": ")
+            out.write(escape_label(benchmark))
+            out.write("</td></tr>\n")
         previous_benchmark = benchmark
-        body_rows.append(render_summary_row(row, include_benchmark=True))
-
-    body = "\n".join(body_rows)
-    return (
-        "<div class='summary-wrap overview-wrap'>"
-        + "<table><thead>"
-        + table_header(include_benchmark=True)
-        + "</thead><tbody>"
-        + body
-        + "</tbody></table>"
-        + "</div>"
-    )
+        out.write(rendered_rows[index][0])
+    out.write("</tbody></table></div>")
+    return out.getvalue()
 
 
+@functools.lru_cache(maxsize=4096)
 def benchmark_tab_id(benchmark: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", benchmark).strip("-").lower()
+    slug = SLUG_PATTERN.sub("-", benchmark).strip("-").lower()
     return f"benchmark-tab-{slug}"
 
 
-def render_benchmark_tabs(rows: List[dict]) -> str:
+@functools.lru_cache(maxsize=4096)
+def chart_card_html(benchmark: str) -> str:
+    # Chart blocks are placeholders filled from chartData in the browser, so the same
+    # markup serves every snapshot page.
+    return f"<section class='chart-card'><div class='chart-host' data-chart-key='{escape_label(benchmark)}'></div></section>"
+
+
+def render_benchmark_tabs(rows: List[dict], rendered_rows: List[Tuple[str, str]]) -> str:
     if not rows:
         return "<p>No benchmark rows yet.</p>"
 
-    grouped: Dict[str, List[dict]] = {}
-    for row in rows:
-        grouped.setdefault(row["benchmark"], []).append(row)
+    grouped: Dict[str, List[str]] = collections.defaultdict(list)
+    for row, (_, row_html) in zip(rows, rendered_rows):
+        grouped[row["benchmark"]].append(row_html)
 
     benchmarks = sorted(grouped.keys())
+    header = table_header(include_benchmark=False)
     buttons = []
+    # Panel markup is appended piece by piece to one list and joined once at the end.
     panels = []
 
     for index, benchmark in enumerate(benchmarks):
-        tab_id = benchmark_tab_id(benchmark)
+        tab_id = escape_label(benchmark_tab_id(benchmark))
+        group_label = benchmark_group_label(benchmark)
         short = benchmark.split(".")[-1]
-        title = f"{benchmark_group_label(benchmark)}: {short}"
         active_class = " active" if index == 0 else ""
         active_bool = "true" if index == 0 else "false"
         hidden_attr = "" if index == 0 else " hidden"
 
         buttons.append(
-            f"<button type='button' class='tab-button{active_class}' data-tab-button='{escape(tab_id)}' aria-selected='{active_bool}'>{escape(title)}</button>"
-        )
-
-        table_rows = "\n".join(render_summary_row(row, include_benchmark=False) for row in grouped[benchmark])
-        panels.append(
-            "<section class='tab-panel"
-            + active_class
-            + f"' data-tab-panel='{escape(tab_id)}'{hidden_attr}>"
-            + f"<h3>{escape(benchmark_group_label(benchmark))}: {escape(benchmark)}</h3>"
-            + "<div class='summary-wrap'>"
-            + "<table><thead>"
-            + table_header(include_benchmark=False)
-            + "</thead><tbody>"
-            + table_rows
-            + "</tbody></table>"
-            + "</div>"
-            + "<div class='panel-chart'>"
-            + f"<section class='chart-card'><div class='chart-host' data-chart-key='{escape(benchmark)}'></div></section>"
-            + "</div>"
-            + "</section>"
+            f"<button type='button' class='tab-button{active_class}' data-tab-button='{tab_id}' aria-selected='{active_bool}'>{escape_label(f'{group_label}: {short}')}</button>"
         )
 
-    return (
-        "<section class='tab-shell'>"
-        + "<div class='tab-buttons'>"
-        + "".join(buttons)
-        + "</div>"
-        + "<div class='tab-panels'>"
-        + "".join(panels)
-        + "</div>"
-        + "</section>"
+        panels.append(f"<section class='tab-panel{active_class}' data-tab-panel='{tab_id}'{hidden_attr}>")
+        panels.append(f"<h3>{escape_label(group_label)}: {escape_label(benchmark)}</h3>")
+        panels.append("<div class='summary-wrap'><table><thead>")
+        panels.append(header)
+        panels.append("</thead><tbody>")
+        panels.append("\n".join(grouped[benchmark]))
+        panels.append("</tbody></table></div><div class='panel-chart'>")
+        panels.append(chart_card_html(benchmark))
+        panels.append("</div></section>")
+
+    return "".join(
+        [
+            "<section class='tab-shell'><div class='tab-buttons'>",
+            *buttons,
+            "</div><div class='tab-panels'>",
+            *panels,
+            "</div></section>",
+        ]
     )
 
 
+@functools.lru_cache(maxsize=8192)
+def sidebar_link_tail(href: str, title: str, sub: str) -> str:
+    # Every page lists the same runs, so each link is escaped once and only the
+    # active class is decided per page.
+    sub_html = f"<span class='run-sub'>{escape(sub)}</span>" if sub else ""
+    return f"' href='{escape(href)}'><span class='run-title'>{escape_label(title)}</span>{sub_html}</a></li>"
+
+
 def render_sidebar(
     run_timeline: List[dict],
     active_run_id: Optional[str],
@@ -485,88 +733,24 @@ def render_sidebar(
             )
         )
 
-    rendered_links = "\n".join(
-        "<li>"
-        + f"<a class='{'active' if is_active else ''}' href='{escape(href)}'>"
-        + f"<span class='run-title'>{escape(title)}</span>"
-        + (f"<span class='run-sub'>{escape(sub)}</span>" if sub else "")
-        + "</a>"
-        + "</li>"
-        for href, title, sub, is_active in links
-    )
-
-    return (
+    out = io.StringIO()
+    out.write(
         "<aside class='sidebar'>"
         "<div class='sidebar-card'>"
         "<h2>Reports</h2>"
         "<p>Navigate weekly snapshots. Each snapshot includes history up to that week.</p>"
         "<ul class='run-list'>"
-        + rendered_links
-        + "</ul>"
-        "</div>"
-        "</aside>"
     )
+    for index, (href, title, sub, is_active) in enumerate(links):
+        if index:
+            out.write("\n")
+        out.write("<li><a class='active" if is_active else "<li><a class='")
+        out.write(sidebar_link_tail(href, title, sub))
+    out.write("</ul></div></aside>")
+    return out.getvalue()
 
 
-def build_html(
-    repo: str,
-    rows: List[dict],
-    chart_data_map: Dict[str, dict],
-    latest_run_id: Optional[str],
-    latest_meta: dict,
-    latest_runner: dict,
-    run_timeline: List[dict],
-    active_run_id: Optional[str],
-    root_rel: str,
-) -> str:
-    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-    benchmark_settings = latest_meta.get("benchmarkSettings", {}) if latest_meta else {}
-    versions_setting = benchmark_settings.get("versions", [])
-    if isinstance(versions_setting, list):
-        versions_list = [str(item) for item in versions_setting]
-    elif versions_setting:
-        versions_list = [str(versions_setting)]
-    else:
-        versions_list = []
-    versions_preview = ", ".join(versions_list[:8]) if versions_list else ""
-    if len(versions_list) > 8:
-        versions_preview = f"{versions_preview}, ... , {versions_list[-1]}"
-    versions_count = len(versions_list)
-
-    env = latest_runner.get("environment", {}) if latest_runner else {}
-    cpu = latest_runner.get("cpu", {}) if latest_runner else {}
-    cpu_details = cpu.get("details", {}) if isinstance(cpu.get("details"), dict) else {}
-    mem = latest_runner.get("memory", {}) if latest_runner else {}
-
-    benchmark_tabs_html = render_benchmark_tabs(rows)
-    overview_table_html = render_overview_table(rows)
-    sidebar = render_sidebar(run_timeline, active_run_id, latest_run_id, root_rel)
-    chart_data_json = json.dumps(chart_data_map).replace("</", "<\\/")
-
-    mode_title = "Latest cumulative report" if active_run_id is None else f"Snapshot for {active_run_id}"
-
-    explain_html = """
-      <section class='help-card'>
-        <h2>How To Read This</h2>
-        <p>Pretend each benchmark is a race. The fastest racer wins.</p>
-        <p><strong>Higher score is better.</strong> Score is <code>ops/ms</code>: how many requests finished in one millisecond.</p>
-        <p><strong>Benchmark Settings</strong> show what this specific run actually executed.</p>
-        <p><strong>&#9733; Best</strong> marks the strict top score in that benchmark.</p>
-        <p><strong>Near best</strong> means the score is within a CV/error uncertainty band of the top score.</p>
-        <p><strong>Delta vs Prev %</strong> compares this run to the previous run for the same version and benchmark.</p>
-        <p><strong>CV%</strong> is consistency across recent runs (not the same as Delta vs Prev): lower means more stable numbers over time.</p>
-        <p><strong>Chart tips:</strong> hover a line point to see timestamp + exact score.</p>
-      </section>
-    """
-
-    return f"""<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"utf-8\">
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">
-  <title>{escape(repo)} benchmark report</title>
-  <style>
-    :root {{
+CSS_BLOCK = """    :root {
       --bg: #e4eef7;
       --panel: #ffffff;
       --ink: #122235;
@@ -575,33 +759,33 @@ def build_html(
       --accent: #1f7a8c;
       --winner-bg: #eaf7ef;
       --winner-border: #2c7a53;
-    }}
-    * {{ box-sizing: border-box; }}
-    body {{
+    }
+    * { box-sizing: border-box; }
+    body {
       margin: 0;
       color: var(--ink);
       font-family: 'IBM Plex Sans', 'Segoe UI', sans-serif;
       background: radial-gradient(circle at 0% 0%, #cfe4f7 0%, var(--bg) 42%);
-    }}
-    .layout {{
+    }
+    .layout {
       width: 100%;
       margin: 0;
       display: grid;
       grid-template-columns: 270px minmax(0, 1fr);
       gap: 1rem;
       padding: 1rem 1.2rem;
-    }}
-    .sidebar {{ position: sticky; top: .8rem; height: fit-content; }}
-    .sidebar-card {{
+    }
+    .sidebar { position: sticky; top: .8rem; height: fit-content; }
+    .sidebar-card {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 12px;
       padding: .9rem;
-    }}
-    .sidebar-card h2 {{ margin: 0 0 .35rem; font-size: 1rem; }}
-    .sidebar-card p {{ margin: 0 0 .75rem; color: var(--muted); font-size: .85rem; line-height: 1.35; }}
-    .run-list {{ list-style: none; margin: 0; padding: 0; display: grid; gap: .4rem; max-height: 80vh; overflow: auto; }}
-    .run-list a {{
+    }
+    .sidebar-card h2 { margin: 0 0 .35rem; font-size: 1rem; }
+    .sidebar-card p { margin: 0 0 .75rem; color: var(--muted); font-size: .85rem; line-height: 1.35; }
+    .run-list { list-style: none; margin: 0; padding: 0; display: grid; gap: .4rem; max-height: 80vh; overflow: auto; }
+    .run-list a {
       display: block;
       text-decoration: none;
       color: var(--ink);
@@ -609,70 +793,70 @@ def build_html(
       border-radius: 8px;
       padding: .5rem .55rem;
       background: #f9fcff;
-    }}
-    .run-list a.active {{ border-color: var(--accent); background: #e8f4fb; }}
-    .run-title {{ display: block; font-size: .84rem; font-weight: 600; }}
-    .run-sub {{ display: block; font-size: .72rem; color: var(--muted); margin-top: .15rem; }}
-    .content {{ min-width: 0; }}
-    .header {{
+    }
+    .run-list a.active { border-color: var(--accent); background: #e8f4fb; }
+    .run-title { display: block; font-size: .84rem; font-weight: 600; }
+    .run-sub { display: block; font-size: .72rem; color: var(--muted); margin-top: .15rem; }
+    .content { min-width: 0; }
+    .header {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 12px;
       padding: 1rem;
       margin-bottom: .95rem;
-    }}
-    h1 {{ margin: 0 0 .35rem; font-size: 1.75rem; }}
-    .meta {{ color: var(--muted); font-size: .92rem; margin-bottom: .2rem; }}
-    .meta strong {{ color: var(--ink); }}
-    .cards {{
+    }
+    h1 { margin: 0 0 .35rem; font-size: 1.75rem; }
+    .meta { color: var(--muted); font-size: .92rem; margin-bottom: .2rem; }
+    .meta strong { color: var(--ink); }
+    .cards {
       display: grid;
       gap: .7rem;
       grid-template-columns: repeat(4, minmax(170px, 1fr));
       margin-top: .8rem;
-    }}
-    .card {{
+    }
+    .card {
       background: #f7fbff;
       border: 1px solid var(--line);
       border-radius: 10px;
       padding: .7rem;
       min-width: 0;
-    }}
-    .label {{ color: var(--muted); font-size: .78rem; text-transform: uppercase; letter-spacing: .04em; margin-bottom: .2rem; }}
-    .value {{ font-family: 'IBM Plex Mono', 'Consolas', monospace; font-size: .84rem; line-height: 1.38; word-break: break-word; }}
-    .help-card {{
+    }
+    .label { color: var(--muted); font-size: .78rem; text-transform: uppercase; letter-spacing: .04em; margin-bottom: .2rem; }
+    .value { font-family: 'IBM Plex Mono', 'Consolas', monospace; font-size: .84rem; line-height: 1.38; word-break: break-word; }
+    .help-card {
       margin-top: .75rem;
       background: #f5fbff;
       border: 1px solid #c8dfef;
       border-radius: 10px;
       padding: .85rem .95rem;
-    }}
-    .help-card h2 {{ margin: 0 0 .45rem; font-size: 1.05rem; }}
-    .help-card p {{ margin: .25rem 0; line-height: 1.4; }}
-    .help-card code {{ background: #e7f2fb; border-radius: 4px; padding: 0 .25rem; }}
-    h2 {{ margin: 1rem 0 .5rem; font-size: 1.2rem; }}
-    h3 {{ margin: 0 0 .45rem; font-size: .95rem; }}
-    .summary-wrap {{
+    }
+    .help-card h2 { margin: 0 0 .45rem; font-size: 1.05rem; }
+    .help-card p { margin: .25rem 0; line-height: 1.4; }
+    .help-card code { background: #e7f2fb; border-radius: 4px; padding: 0 .25rem; }
+    h2 { margin: 1rem 0 .5rem; font-size: 1.2rem; }
+    h3 { margin: 0 0 .45rem; font-size: .95rem; }
+    .summary-wrap {
       border: 1px solid var(--line);
       border-radius: 10px;
       overflow: auto;
       max-height: 64vh;
       background: var(--panel);
       width: 100%;
-    }}
-    .tab-shell {{
+    }
+    .tab-shell {
       border: 1px solid var(--line);
       border-radius: 10px;
       background: var(--panel);
       padding: .75rem;
       margin-bottom: .9rem;
-    }}
-    .tab-buttons {{
+    }
+    .tab-buttons {
       display: flex;
       flex-wrap: wrap;
       gap: .5rem;
       margin-bottom: .65rem;
-    }}
-    .tab-button {{
+    }
+    .tab-button {
       border: 1px solid #b8d2e8;
       background: #f4faff;
       color: #21405e;
@@ -681,29 +865,29 @@ def build_html(
       font-size: .82rem;
       font-weight: 600;
       cursor: pointer;
-    }}
-    .tab-button.active {{
+    }
+    .tab-button.active {
       border-color: var(--accent);
       background: #deeff8;
       color: #173752;
-    }}
-    .tab-panel {{ display: none; }}
-    .tab-panel.active {{ display: block; }}
-    .tab-panel h3 {{ margin-bottom: .5rem; }}
-    table {{ width: 100%; border-collapse: collapse; font-size: .87rem; }}
-    th, td {{
+    }
+    .tab-panel { display: none; }
+    .tab-panel.active { display: block; }
+    .tab-panel h3 { margin-bottom: .5rem; }
+    table { width: 100%; border-collapse: collapse; font-size: .87rem; }
+    th, td {
       border-bottom: 1px solid var(--line);
       padding: .45rem .4rem;
       text-align: left;
       vertical-align: top;
       white-space: nowrap;
-    }}
-    th {{ position: sticky; top: 0; background: #e9f3fb; z-index: 1; }}
-    .winner-row {{ background: var(--winner-bg); }}
-    .winner-row td:first-child {{ border-left: 4px solid var(--winner-border); }}
-    .cobest-row {{ background: #f9f5e8; }}
-    .cobest-row td:first-child {{ border-left: 4px solid #a6782f; }}
-    .winner-badge {{
+    }
+    th { position: sticky; top: 0; background: #e9f3fb; z-index: 1; }
+    .winner-row { background: var(--winner-bg); }
+    .winner-row td:first-child { border-left: 4px solid var(--winner-border); }
+    .cobest-row { background: #f9f5e8; }
+    .cobest-row td:first-child { border-left: 4px solid #a6782f; }
+    .winner-badge {
       display: inline-block;
       border: 1px solid var(--winner-border);
       border-radius: 999px;
@@ -712,8 +896,8 @@ def build_html(
       font-weight: 700;
       background: #dff1e8;
       color: #184d33;
-    }}
-    .cobest-badge {{
+    }
+    .cobest-badge {
       display: inline-block;
       border: 1px solid #8a6a2d;
       border-radius: 999px;
@@ -722,33 +906,33 @@ def build_html(
       font-weight: 700;
       background: #f2e9cf;
       color: #5f4a1f;
-    }}
-    .chart-card {{
+    }
+    .chart-card {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 10px;
       padding: .75rem;
-    }}
-    .chart-host {{
+    }
+    .chart-host {
       width: 100%;
       height: 340px;
       min-height: 240px;
-    }}
-    .panel-chart {{ margin-top: .7rem; }}
-    .section-note {{
+    }
+    .panel-chart { margin-top: .7rem; }
+    .section-note {
       margin: .2rem 0 .65rem;
       color: var(--muted);
       font-size: .9rem;
-    }}
-    .overview-note {{
+    }
+    .overview-note {
       margin: .2rem 0 .65rem;
       color: var(--muted);
       font-size: .88rem;
-    }}
-    .overview-wrap {{
+    }
+    .overview-wrap {
       max-height: 58vh;
-    }}
-    .overview-divider td {{
+    }
+    .overview-divider td {
       background: #f3f8fd;
       color: #294863;
       font-size: .78rem;
@@ -758,198 +942,396 @@ def build_html(
       border-bottom: 1px solid #dbe8f3;
       padding-top: .3rem;
       padding-bottom: .3rem;
-    }}
-    footer {{ margin-top: .85rem; color: var(--muted); font-size: .84rem; }}
-    @media (max-width: 1150px) {{
-      .layout {{ grid-template-columns: 1fr; }}
-      .sidebar {{ position: static; }}
-      .run-list {{ max-height: none; }}
-      .cards {{ grid-template-columns: repeat(2, minmax(170px, 1fr)); }}
-    }}
-    @media (max-width: 680px) {{
-      .cards {{ grid-template-columns: 1fr; }}
-      th, td {{ font-size: .8rem; }}
-      h1 {{ font-size: 1.35rem; }}
-    }}
-  </style>
+    }
+    footer { margin-top: .85rem; color: var(--muted); font-size: .84rem; }
+    @media (max-width: 1150px) {
+      .layout { grid-template-columns: 1fr; }
+      .sidebar { position: static; }
+      .run-list { max-height: none; }
+      .cards { grid-template-columns: repeat(2, minmax(170px, 1fr)); }
+    }
+    @media (max-width: 680px) {
+      .cards { grid-template-columns: 1fr; }
+      th, td { font-size: .8rem; }
+      h1 { font-size: 1.35rem; }
+    }
+"""
+
+EXPLAIN_HTML = """
+      <section class='help-card'>
+        <h2>How To Read This</h2>
+        <p>Pretend each benchmark is a race. The fastest racer wins.</p>
+        <p><strong>Higher score is better.</strong> Score is <code>ops/ms</code>: how many requests finished in one millisecond.</p>
+        <p><strong>Benchmark Settings</strong> show what this specific run actually executed.</p>
+        <p><strong>&#9733; Best</strong> marks the strict top score in that benchmark.</p>
+        <p><strong>Near best</strong> means the score is within a CV/error uncertainty band of the top score.</p>
+        <p><strong>Delta vs Prev %</strong> compares this run to the previous run for the same version and benchmark.</p>
+        <p><strong>CV%</strong> is consistency across recent runs (not the same as Delta vs Prev): lower means more stable numbers over time.</p>
+        <p><strong>Chart tips:</strong> hover a line point to see timestamp + exact score.</p>
+      </section>
+    """
+
+
+# The stylesheet and the explanation block are static, so they are kept out of the
+# per-page format_map call and written as precomputed strings.
+PAGE_HEAD_OPEN = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>"""
+
+PAGE_STYLE = (
+    """ benchmark report</title>
+  <style>
+"""
+    + CSS_BLOCK
+    + """  </style>
 </head>
 <body>
-  <div class=\"layout\">
-    {sidebar}
-    <main class=\"content\">
-      <section class=\"header\">
+  <div class="layout">
+    """
+)
+
+PAGE_HEADER_TEMPLATE = """{sidebar}
+    <main class="content">
+      <section class="header">
         <h1>Javalin Performance Benchmarks</h1>
-        <div class=\"meta\">Repository: <strong>{escape(repo)}</strong></div>
-        <div class=\"meta\">View: <strong>{escape(mode_title)}</strong> | Generated: {escape(generated)} | Latest run in history: {escape(latest_run_id or '')}</div>
+        <div class="meta">Repository: <strong>{repo}</strong></div>
+        <div class="meta">View: <strong>{mode_title}</strong> | Generated: {generated} | Latest run in history: {latest_run_id}</div>
 
-        <div class=\"cards\">
-          <div class=\"card\">
-            <div class=\"label\">Benchmark Settings</div>
-            <div class=\"value\">versionCount={versions_count}<br>versions={escape(versions_preview)}<br>iterations={escape(str(benchmark_settings.get('iterations', '')))}<br>iterationTimeMs={escape(str(benchmark_settings.get('iterationTimeMs', '')))}<br>forks={escape(str(benchmark_settings.get('forks', '')))}<br>threads={escape(str(benchmark_settings.get('threads', '')))}</div>
+        <div class="cards">
+          <div class="card">
+            <div class="label">Benchmark Settings</div>
+            <div class="value">versionCount={versions_count}<br>versions={versions_preview}<br>iterations={iterations}<br>iterationTimeMs={iteration_time_ms}<br>forks={forks}<br>threads={threads}</div>
           </div>
-          <div class=\"card\">
-            <div class=\"label\">Runner Image</div>
-            <div class=\"value\">ImageOS={escape(env.get('ImageOS', ''))}<br>ImageVersion={escape(env.get('ImageVersion', ''))}<br>Runner={escape(env.get('RUNNER_NAME', ''))}<br>OS={escape(env.get('RUNNER_OS', ''))}/{escape(env.get('RUNNER_ARCH', ''))}</div>
+          <div class="card">
+            <div class="label">Runner Image</div>
+            <div class="value">ImageOS={image_os}<br>ImageVersion={image_version}<br>Runner={runner_name}<br>OS={runner_os}/{runner_arch}</div>
           </div>
-          <div class=\"card\">
-            <div class=\"label\">CPU</div>
-            <div class=\"value\">model={escape(cpu_details.get('Model name', ''))}<br>nproc={escape(str(cpu.get('nproc', '')))}<br>cores={escape(cpu_details.get('CPU(s)', ''))}<br>maxMHz={escape(cpu_details.get('CPU max MHz', ''))}</div>
+          <div class="card">
+            <div class="label">CPU</div>
+            <div class="value">model={cpu_model}<br>nproc={nproc}<br>cores={cores}<br>maxMHz={max_mhz}</div>
           </div>
-          <div class=\"card\">
-            <div class=\"label\">Memory</div>
-            <div class=\"value\">memTotal={escape(mem.get('meminfo', {}).get('MemTotal', ''))}<br>swapTotal={escape(mem.get('meminfo', {}).get('SwapTotal', ''))}<br>cgroupCpuMax={escape(str(cpu.get('cgroupCpuMax', '')))}</div>
+          <div class="card">
+            <div class="label">Memory</div>
+            <div class="value">memTotal={mem_total}<br>swapTotal={swap_total}<br>cgroupCpuMax={cgroup_cpu_max}</div>
           </div>
         </div>
 
-        {explain_html}
+        """
+
+PAGE_TABS_OPEN = """
       </section>
 
       <h2>Per-Benchmark Results</h2>
-      <p class=\"section-note\">Each tab shows one benchmark with the latest per-version table and the trend chart directly below it.</p>
-      {benchmark_tabs_html}
+      <p class="section-note">Each tab shows one benchmark with the latest per-version table and the trend chart directly below it.</p>
+      """
+
+PAGE_OVERVIEW_OPEN = """
 
       <h2>All Benchmarks Overview</h2>
-      <p class=\"overview-note\">This is the same latest table data as the tabs above, collected into one table for quick scanning.</p>
-      {overview_table_html}
+      <p class="overview-note">This is the same latest table data as the tabs above, collected into one table for quick scanning.</p>
+      """
+
+PAGE_SCRIPT_OPEN = """
 
       <footer>Higher score is better in throughput mode. Use Delta vs Best % plus Best Band % to spot statistically close results that can be treated as tied.</footer>
     </main>
   </div>
-  <script src="https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js"></script>
+  <script async data-echarts src="https://cdn.jsdelivr.net/npm/echarts@5/dist/echarts.min.js"></script>
   <script>
-    (() => {{
-      const chartData = {chart_data_json};
+    (() => {
+      const chartData = """
+
+PAGE_SCRIPT_TAIL = """;
       const buttons = Array.from(document.querySelectorAll('[data-tab-button]'));
       const panels = Array.from(document.querySelectorAll('[data-tab-panel]'));
-      if (!buttons.length || !panels.length) {{
+      if (!buttons.length || !panels.length) {
         return;
-      }}
+      }
+      const buttonByTab = new Map(buttons.map((button) => [button.dataset.tabButton, button]));
+      const panelByTab = new Map(panels.map((panel) => [panel.dataset.tabPanel, panel]));
 
+      // Charts are kept in least-recently-shown order and the oldest is disposed once
+      // more than maxChartInstances exist, so cycling through tabs stays bounded.
       const chartInstances = new Map();
-
-      const buildOption = (spec) => {{
-        const labels = spec.runs.map((run) => run.label);
-        const fullLabels = spec.runs.map((run) => run.fullLabel);
-        return {{
+      const maxChartInstances = 8;
+
+      // ECharts loads asynchronously; panels shown before it arrives are rendered
+      // from its load (or error) handler.
+      const pendingPanels = new Set();
+      let chartLibraryFailed = false;
+      const flushPendingPanels = () => {
+        const waiting = Array.from(pendingPanels);
+        pendingPanels.clear();
+        waiting.forEach((panel) => renderPanelChart(panel));
+      };
+      const echartsScript = document.querySelector('script[data-echarts]');
+      if (echartsScript) {
+        echartsScript.addEventListener('load', flushPendingPanels);
+        echartsScript.addEventListener('error', () => {
+          chartLibraryFailed = true;
+          flushPendingPanels();
+        });
+      }
+
+      const runTable = chartData.runs;
+      const denseSeriesLength = 200;
+
+      const buildOption = (spec) => {
+        const runs = spec.runRefs ? spec.runRefs.map((ref) => runTable[ref]) : runTable;
+        const labels = runs.map((run) => run.label);
+        const fullLabels = runs.map((run) => run.fullLabel);
+        // Tooltip values are formatted on first hover and reused afterwards.
+        const valueTexts = spec.series.map(() => []);
+        return {
           animation: false,
           color: spec.series.map((line) => line.color),
-          grid: {{ left: 52, right: 20, top: 44, bottom: 44, containLabel: true }},
-          legend: {{ top: 0, left: 0, type: 'scroll' }},
-          tooltip: {{
+          grid: { left: 52, right: 20, top: 44, bottom: 44, containLabel: true },
+          legend: { top: 0, left: 0, type: 'scroll' },
+          tooltip: {
             trigger: 'axis',
             confine: true,
-            axisPointer: {{ type: 'cross' }},
-            formatter: (params) => {{
-              if (!params || !params.length) {{
+            axisPointer: { type: 'cross' },
+            formatter: (params) => {
+              if (!params || !params.length) {
                 return '';
-              }}
+              }
               const dataIndex = params[0].dataIndex;
               const lines = [fullLabels[dataIndex] || labels[dataIndex] || ''];
-              params.forEach((item) => {{
-                if (item.value === null || item.value === undefined || item.value === '-') {{
+              params.forEach((item) => {
+                if (item.value === null || item.value === undefined || item.value === '-') {
                   return;
-                }}
-                const numeric = Number(item.value);
-                const valueText = Number.isFinite(numeric) ? numeric.toFixed(4) : String(item.value);
-                lines.push(`${{item.seriesName}}: ${{valueText}} ${{spec.scoreUnit}}`);
-              }});
+                }
+                const cache = valueTexts[item.seriesIndex];
+                let valueText = cache[item.dataIndex];
+                if (valueText === undefined) {
+                  const numeric = Number(item.value);
+                  valueText = Number.isFinite(numeric) ? numeric.toFixed(4) : String(item.value);
+                  cache[item.dataIndex] = valueText;
+                }
+                lines.push(`${item.seriesName}: ${valueText} ${spec.scoreUnit}`);
+              });
               return lines.join('<br/>');
-            }},
-          }},
-          xAxis: {{
+            },
+          },
+          xAxis: {
             type: 'category',
             boundaryGap: false,
             data: labels,
-            axisLabel: {{ hideOverlap: true }},
-            axisTick: {{ alignWithLabel: true }},
-          }},
-          yAxis: {{
+            axisLabel: { hideOverlap: true },
+            axisTick: { alignWithLabel: true },
+          },
+          yAxis: {
             type: 'value',
             name: spec.scoreUnit,
-            splitLine: {{ lineStyle: {{ color: '#dce9f6' }} }},
-          }},
-          series: spec.series.map((line) => ({{
-            name: line.name,
-            type: 'line',
-            data: line.data,
-            showSymbol: true,
-            symbolSize: 6,
-            connectNulls: false,
-            smooth: false,
-            lineStyle: {{ width: 2 }},
-            itemStyle: {{ color: line.color }},
-            emphasis: {{ focus: 'series' }},
-          }})),
-        }};
-      }};
-
-      const renderPanelChart = (panel) => {{
+            splitLine: { lineStyle: { color: '#dce9f6' } },
+          },
+          series: spec.series.map((line) => {
+            // Long lines are drawn without per-point symbols or hover emphasis.
+            const dense = line.data.length > denseSeriesLength;
+            return {
+              name: line.name,
+              type: 'line',
+              data: line.data,
+              sampling: 'lttb',
+              showSymbol: !dense,
+              symbolSize: 6,
+              connectNulls: false,
+              smooth: false,
+              lineStyle: { width: 2 },
+              itemStyle: { color: line.color },
+              ...(dense ? {} : { emphasis: { focus: 'series' } }),
+            };
+          }),
+        };
+      };
+
+      const renderPanelChart = (panel) => {
         const host = panel.querySelector('.chart-host');
-        if (!host) {{
+        if (!host) {
           return;
-        }}
+        }
         const key = host.dataset.chartKey;
-        const spec = chartData[key];
-        if (!spec) {{
+        const spec = chartData.charts[key];
+        if (!spec) {
           host.textContent = 'No trend data yet.';
           return;
-        }}
-        if (typeof echarts === 'undefined') {{
-          host.textContent = 'Chart library failed to load.';
+        }
+        if (typeof echarts === 'undefined') {
+          if (chartLibraryFailed) {
+            host.textContent = 'Chart library failed to load.';
+          } else {
+            pendingPanels.add(panel);
+          }
           return;
-        }}
+        }
 
+        // A chart's data never changes after its first render, so showing its tab
+        // again only needs a resize for the now visible host.
         let chart = chartInstances.get(key);
-        if (!chart) {{
-          chart = echarts.init(host);
+        if (chart) {
+          chartInstances.delete(key);
           chartInstances.set(key, chart);
-        }}
+          chart.resize();
+          return;
+        }
 
-        chart.setOption(buildOption(spec), true);
-        chart.resize();
-      }};
+        chart = echarts.init(host);
+        chartInstances.set(key, chart);
+        if (chartInstances.size > maxChartInstances) {
+          const oldestKey = chartInstances.keys().next().value;
+          chartInstances.get(oldestKey).dispose();
+          chartInstances.delete(oldestKey);
+        }
+        chart.setOption(buildOption(spec));
+      };
+
+      // Charts below the fold are only drawn once their host scrolls into view.
+      const chartObserver = 'IntersectionObserver' in window
+        ? new IntersectionObserver((entries) => {
+          entries.forEach((entry) => {
+            if (entry.isIntersecting) {
+              chartObserver.unobserve(entry.target);
+              renderPanelChart(entry.target.closest('[data-tab-panel]'));
+            }
+          });
+        })
+        : null;
 
-      const setActive = (tabId) => {{
-        buttons.forEach((button) => {{
-          const active = button.dataset.tabButton === tabId;
+      const scheduleChart = (panel) => {
+        const host = panel.querySelector('.chart-host');
+        if (host && chartObserver) {
+          chartObserver.observe(host);
+        } else {
+          renderPanelChart(panel);
+        }
+      };
+
+      const setActive = (tabId) => {
+        buttonByTab.forEach((button, buttonTabId) => {
+          const active = buttonTabId === tabId;
           button.classList.toggle('active', active);
           button.setAttribute('aria-selected', active ? 'true' : 'false');
-        }});
+        });
 
-        panels.forEach((panel) => {{
-          const active = panel.dataset.tabPanel === tabId;
+        panelByTab.forEach((panel, panelTabId) => {
+          const active = panelTabId === tabId;
           panel.classList.toggle('active', active);
           panel.hidden = !active;
-        }});
+        });
 
-        const activePanel = panels.find((panel) => panel.dataset.tabPanel === tabId);
-        if (activePanel) {{
-          renderPanelChart(activePanel);
-        }}
-      }};
+        const activePanel = panelByTab.get(tabId);
+        if (activePanel) {
+          scheduleChart(activePanel);
+        }
+      };
 
-      buttons.forEach((button) => {{
+      buttons.forEach((button) => {
         button.addEventListener('click', () => setActive(button.dataset.tabButton));
-      }});
+      });
 
       const initiallyActive = buttons.find((button) => button.classList.contains('active')) || buttons[0];
-      if (initiallyActive) {{
+      if (initiallyActive) {
         setActive(initiallyActive.dataset.tabButton);
-      }}
-
-      window.addEventListener('resize', () => {{
-        chartInstances.forEach((chart) => chart.resize());
-      }});
-    }})();
+      }
+
+      window.addEventListener('resize', () => {
+        chartInstances.forEach((chart) => {
+          if (chart.getDom().offsetParent !== null) {
+            chart.resize();
+          }
+        });
+      });
+    })();
   </script>
 </body>
 </html>
 """
 
 
-def make_run_timeline(run_metadata: Dict[str, dict]) -> List[dict]:
+def render_page_body(rows: List[dict], chart_data_map: Dict[str, dict]) -> PageBody:
+    rendered_rows = [render_summary_row(row) for row in rows]
+    # Compact separators keep the inlined chart data small; the page is served as UTF-8.
+    chart_payload = pack_chart_data(downsample_chart_data(chart_data_map))
+    chart_data_json = json.dumps(chart_payload, separators=(",", ":"), ensure_ascii=False, check_circular=False)
+    return PageBody(
+        tabs_html=render_benchmark_tabs(rows, rendered_rows),
+        overview_html=render_overview_table(rows, rendered_rows),
+        chart_data_json=chart_data_json.replace("</", "<\\/"),
+    )
+
+
+def build_html_iter(ctx: PageContext, body: PageBody, run_timeline: List[dict]) -> Iterator[str]:
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    benchmark_settings = ctx.meta.get("benchmarkSettings", {})
+    versions_setting = benchmark_settings.get("versions", [])
+    if isinstance(versions_setting, list):
+        versions_list = [str(item) for item in versions_setting]
+    elif versions_setting:
+        versions_list = [str(versions_setting)]
+    else:
+        versions_list = []
+    versions_preview = ", ".join(versions_list[:8]) if versions_list else ""
+    if len(versions_list) > 8:
+        versions_preview = f"{versions_preview}, ... , {versions_list[-1]}"
+    versions_count = len(versions_list)
+
+    env = ctx.runner.get("environment", {})
+    cpu = ctx.runner.get("cpu", {})
+    cpu_details = cpu.get("details", {}) if isinstance(cpu.get("details"), dict) else {}
+    mem = ctx.runner.get("memory", {})
+    cgroup = ctx.runner.get("cgroup", {})
+    cgroup_cpu_max = cgroup.get("cpu.max", cpu.get("cgroupCpuMax", ""))
+
+    sidebar = render_sidebar(run_timeline, ctx.active_run_id, ctx.latest_run_id, ctx.root_rel)
+
+    mode_title = "Latest cumulative report" if ctx.active_run_id is None else f"Snapshot for {ctx.active_run_id}"
+
+    yield PAGE_HEAD_OPEN
+    yield escape_label(ctx.repo)
+    yield PAGE_STYLE
+    yield PAGE_HEADER_TEMPLATE.format_map(
+        {
+            "repo": escape_label(ctx.repo),
+            "sidebar": sidebar,
+            "mode_title": escape(mode_title),
+            "generated": escape(generated),
+            "latest_run_id": escape(ctx.latest_run_id or ""),
+            "versions_count": versions_count,
+            "versions_preview": escape(versions_preview),
+            "iterations": escape(str(benchmark_settings.get("iterations", ""))),
+            "iteration_time_ms": escape(str(benchmark_settings.get("iterationTimeMs", ""))),
+            "forks": escape(str(benchmark_settings.get("forks", ""))),
+            "threads": escape(str(benchmark_settings.get("threads", ""))),
+            "image_os": escape(env.get("ImageOS", "")),
+            "image_version": escape(env.get("ImageVersion", "")),
+            "runner_name": escape(env.get("RUNNER_NAME", "")),
+            "runner_os": escape(env.get("RUNNER_OS", "")),
+            "runner_arch": escape(env.get("RUNNER_ARCH", "")),
+            "cpu_model": escape(cpu_details.get("Model name", "")),
+            "nproc": escape(str(cpu.get("nproc", ""))),
+            "cores": escape(cpu_details.get("CPU(s)", "")),
+            "max_mhz": escape(cpu_details.get("CPU max MHz", "")),
+            "mem_total": escape(mem.get("meminfo", {}).get("MemTotal", "")),
+            "swap_total": escape(mem.get("meminfo", {}).get("SwapTotal", "")),
+            "cgroup_cpu_max": escape(str(cgroup_cpu_max)),
+        }
+    )
+    yield EXPLAIN_HTML
+    yield PAGE_TABS_OPEN
+    yield body.tabs_html
+    yield PAGE_OVERVIEW_OPEN
+    yield body.overview_html
+    yield PAGE_SCRIPT_OPEN
+    yield body.chart_data_json
+    yield PAGE_SCRIPT_TAIL
+
+
+def make_run_timeline(run_metadata: Dict[str, dict], run_order: List[str]) -> List[dict]:
     timeline = []
-    for run_id in sorted_run_ids(run_metadata):
+    for run_id in run_order:
         timeline.append(
             {
                 "runId": run_id,
@@ -960,40 +1342,60 @@ def make_run_timeline(run_metadata: Dict[str, dict]) -> List[dict]:
     return timeline
 
 
-def records_upto_run(records: List[Record], run_order: List[str], run_id: str) -> List[Record]:
-    if run_id not in run_order:
-        return []
-    idx = run_order.index(run_id)
-    included = set(run_order[: idx + 1])
-    return [record for record in records if record.run_id in included]
-
-
 def write_report(
+    ctx: PageContext,
+    output_path: Path,
+    body: PageBody,
+    run_timeline: List[dict],
+    gzip_copy: bool = False,
+) -> None:
+    segments = build_html_iter(ctx, body, run_timeline)
+    with output_path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        if not gzip_copy:
+            handle.writelines(segments)
+            return
+        # Servers that support precompressed files (e.g. nginx gzip_static) can send
+        # the .gz sibling as-is; both files are written from the same segments. The
+        # header mtime is pinned so identical input gives identical .gz bytes.
+        gzip_path = output_path.with_name(output_path.name + ".gz")
+        gzip_file = gzip.GzipFile(gzip_path, "wb", compresslevel=6, mtime=0)
+        with io.TextIOWrapper(gzip_file, encoding="utf-8") as compressed:
+            for segment in segments:
+                handle.write(segment)
+                compressed.write(segment)
+
+
+def write_snapshot_report(
+    ctx: PageContext,
     output_path: Path,
-    repo: str,
     rows: List[dict],
-    records: List[Record],
-    latest_run_id: Optional[str],
-    latest_meta: dict,
-    latest_runner: dict,
+    chart_data_map: Dict[str, dict],
     run_timeline: List[dict],
-    active_run_id: Optional[str],
-    root_rel: str,
+    gzip_copy: bool = False,
 ) -> None:
-    chart_data_map = build_chart_data_map(records)
-    output_path.write_text(
-        build_html(
-            repo=repo,
-            rows=rows,
-            chart_data_map=chart_data_map,
-            latest_run_id=latest_run_id,
-            latest_meta=latest_meta,
-            latest_runner=latest_runner,
-            run_timeline=run_timeline,
-            active_run_id=active_run_id,
-            root_rel=root_rel,
-        )
-    )
+    write_report(ctx, output_path, render_page_body(rows, chart_data_map), run_timeline, gzip_copy)
+
+
+def write_reports(pages: Iterable[dict], page_count: int) -> None:
+    # Pages are independent once their rows and chart data are known, so longer
+    # histories render them across processes. Pages are produced lazily and only a
+    # few are in flight at a time, so memory stays flat as the history grows.
+    cpu_count = os.cpu_count() or 1
+    if page_count < PARALLEL_PAGE_MIN_COUNT or cpu_count < 2:
+        for page in pages:
+            write_snapshot_report(**page)
+        return
+    max_in_flight = 2 * cpu_count
+    with concurrent.futures.ProcessPoolExecutor(max_workers=cpu_count) as executor:
+        pending = set()
+        for page in pages:
+            if len(pending) >= max_in_flight:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(write_snapshot_report, **page))
+        for future in concurrent.futures.as_completed(pending):
+            future.result()
 
 
 def main():
@@ -1001,6 +1403,7 @@ def main():
     parser.add_argument("--history-root", required=True, help="Directory containing runs/<run-id>")
     parser.add_argument("--output-dir", required=True, help="Output directory for static pages")
     parser.add_argument("--repository", required=True, help="Repository name for display")
+    parser.add_argument("--gzip", action="store_true", help="Also write a gzip-compressed copy of every page")
     args = parser.parse_args()
 
     history_root = Path(args.history_root)
@@ -1008,14 +1411,10 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
     (output_dir / "runs").mkdir(parents=True, exist_ok=True)
 
-    records, run_metadata, run_runner = load_records(history_root)
-    latest_run_id = select_latest_run_id(run_metadata)
-
-    latest_meta = run_metadata.get(latest_run_id, {}) if latest_run_id else {}
-    latest_runner = run_runner.get(latest_run_id, {}) if latest_run_id else {}
-
-    run_timeline = make_run_timeline(run_metadata)
-    run_order = [item["runId"] for item in run_timeline]
+    records, records_by_run, run_metadata, run_runner = load_records(history_root)
+    run_order = sorted_run_ids(run_metadata)
+    latest_run_id = run_order[-1] if run_order else None
+    run_timeline = make_run_timeline(run_metadata, run_order)
 
     summary_rows = summarize(records)
 
@@ -1029,38 +1428,58 @@ def main():
         "rows": summary_rows,
     }
 
-    (output_dir / "summary.json").write_text(json.dumps(summary_payload, indent=2) + "\n")
+    with (output_dir / "summary.json").open("w", encoding="utf-8") as handle:
+        json.dump(summary_payload, handle, indent=2)
+        handle.write("\n")
 
+    full_chart_data_map = build_chart_data_map(records)
+    index_body = render_page_body(summary_rows, full_chart_data_map)
     write_report(
+        ctx=PageContext(
+            repo=args.repository,
+            latest_run_id=latest_run_id,
+            meta=run_metadata.get(latest_run_id) or {},
+            runner=run_runner.get(latest_run_id) or {},
+            active_run_id=None,
+            root_rel=".",
+        ),
         output_path=output_dir / "index.html",
-        repo=args.repository,
-        rows=summary_rows,
-        records=records,
-        latest_run_id=latest_run_id,
-        latest_meta=latest_meta,
-        latest_runner=latest_runner,
+        body=index_body,
         run_timeline=run_timeline,
-        active_run_id=None,
-        root_rel=".",
+        gzip_copy=args.gzip,
     )
 
-    for run_id in run_order:
-        snapshot_records = records_upto_run(records, run_order, run_id)
-        snapshot_rows = summarize(snapshot_records)
-        snapshot_meta = run_metadata.get(run_id, {})
-        snapshot_runner = run_runner.get(run_id, {})
-        write_report(
-            output_path=output_dir / "runs" / f"{run_id}.html",
-            repo=args.repository,
-            rows=snapshot_rows,
-            records=snapshot_records,
-            latest_run_id=latest_run_id,
-            latest_meta=snapshot_meta,
-            latest_runner=snapshot_runner,
-            run_timeline=run_timeline,
-            active_run_id=run_id,
-            root_rel="..",
-        )
+    # Snapshots grow run by run, so their summaries are folded in incrementally and
+    # their charts are cut from the full chart data instead of being rebuilt.
+    run_position = {run_id: idx for idx, run_id in enumerate(run_order)}
+    sliced_specs: Dict[str, Tuple[int, dict]] = {}
+
+    def snapshot_pages() -> Iterator[dict]:
+        for position, (run_id, snapshot_rows) in enumerate(iter_snapshots(records_by_run, run_order)):
+            ctx = PageContext(
+                repo=args.repository,
+                latest_run_id=latest_run_id,
+                meta=run_metadata.get(run_id) or {},
+                runner=run_runner.get(run_id) or {},
+                active_run_id=run_id,
+                root_rel="..",
+            )
+            output_path = output_dir / "runs" / f"{run_id}.html"
+            if run_id == latest_run_id:
+                # The latest snapshot covers the full history, so its tables and charts
+                # are the ones already rendered for index.html.
+                write_report(ctx, output_path, index_body, run_timeline, args.gzip)
+                continue
+            yield {
+                "ctx": ctx,
+                "output_path": output_path,
+                "rows": snapshot_rows,
+                "chart_data_map": slice_chart_data(full_chart_data_map, run_position, position, sliced_specs),
+                "run_timeline": run_timeline,
+                "gzip_copy": args.gzip,
+            }
+
+    write_reports(snapshot_pages(), len(run_order))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import sys
 
 
 def main():
@@ -12,8 +13,7 @@ def main():
     if not isinstance(values, list):
         raise SystemExit("Input must be a JSON array")
 
-    for value in values:
-        print(str(value))
+    sys.stdout.write("".join(f"{value}\n" for value in values))
 
 
 if __name__ == "__main__":
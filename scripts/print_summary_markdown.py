@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import sys
 from pathlib import Path
 
+ROW_TEMPLATE = "| {version} | {benchmark} | {score} {unit} | {delta} | {mean} | {cv} | {samples} |"
+FIXED_POINT_SPECS = {2: ".2f", 3: ".3f"}
+
 
 def fmt(value, digits=3):
     if value is None:
         return ""
+    spec = FIXED_POINT_SPECS.get(digits) or f".{digits}f"
+    # summary.json scores load as floats, which need no conversion.
+    if isinstance(value, float):
+        return format(value, spec)
     try:
-        return f"{float(value):.{digits}f}"
+        return format(float(value), spec)
     except Exception:
         return str(value)
 
@@ -19,24 +27,30 @@ def main():
     parser.add_argument("--limit", type=int, default=40, help="Max rows")
     args = parser.parse_args()
 
-    payload = json.loads(Path(args.summary_json).read_text())
+    payload = json.loads(Path(args.summary_json).read_bytes())
     rows = payload.get("rows", [])[: args.limit]
 
-    print(f"## Benchmark summary ({payload.get('latestRunId', '')})")
-    print("")
-    print("| Version | Benchmark | Latest | Delta vs prev % | Mean(last8) | CV%(last8) | Samples |")
-    print("|---|---|---:|---:|---:|---:|---:|")
+    lines = [
+        f"## Benchmark summary ({payload.get('latestRunId', '')})",
+        "",
+        "| Version | Benchmark | Latest | Delta vs prev % | Mean(last8) | CV%(last8) | Samples |",
+        "|---|---|---:|---:|---:|---:|---:|",
+    ]
     for row in rows:
-        print(
-            "| "
-            + f"{row.get('version', '')} | "
-            + f"{row.get('benchmark', '')} | "
-            + f"{fmt(row.get('latestScore'))} {row.get('scoreUnit', '')} | "
-            + f"{fmt(row.get('deltaVsPreviousPercent'), 2)} | "
-            + f"{fmt(row.get('meanLast8'))} | "
-            + f"{fmt(row.get('cvLast8Percent'), 2)} | "
-            + f"{row.get('samples', '')} |"
+        lines.append(
+            ROW_TEMPLATE.format(
+                version=row.get("version", ""),
+                benchmark=row.get("benchmark", ""),
+                score=fmt(row.get("latestScore")),
+                unit=row.get("scoreUnit", ""),
+                delta=fmt(row.get("deltaVsPreviousPercent"), 2),
+                mean=fmt(row.get("meanLast8")),
+                cv=fmt(row.get("cvLast8Percent"), 2),
+                samples=row.get("samples", ""),
+            )
         )
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
 
 
 if __name__ == "__main__":
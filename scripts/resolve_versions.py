@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 import argparse
 import json
-import re
+import sys
 from pathlib import Path
 
 
 def parse_tokens(raw: str):
-    return [token.strip() for token in re.split(r"[\s,]+", raw) if token.strip()]
+    return raw.replace(",", " ").split()
 
 
 def main():
@@ -29,7 +29,8 @@ def main():
     if not tokens:
         raise SystemExit("No versions configured. Set workflow input versions or edit config/versions.txt")
 
-    print(json.dumps(tokens))
+    json.dump(tokens, sys.stdout)
+    sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import collect_runner_info  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+class ParseLscpuTest(unittest.TestCase):
+    def test_keeps_every_lscpu_field(self):
+        output = (FIXTURES / "lscpu-x86_64.txt").read_text()
+        details = collect_runner_info.parse_lscpu(output)
+
+        expected = {}
+        for line in output.splitlines():
+            key, sep, value = line.partition(":")
+            if sep:
+                expected[key.strip()] = value.strip()
+        self.assertEqual(details, expected)
+
+    def test_uses_lscpu_value_formats(self):
+        details = collect_runner_info.parse_lscpu((FIXTURES / "lscpu-x86_64.txt").read_text())
+
+        self.assertEqual(details["Architecture"], "x86_64")
+        self.assertEqual(details["Model name"], "Intel(R) Xeon(R) Processor")
+        self.assertEqual(details["L2 cache"], "2 MiB (1 instance)")
+        self.assertEqual(details["Socket(s)"], "1")
+        self.assertIn("Vulnerability Spectre v2", details)
+
+
+if __name__ == "__main__":
+    unittest.main()
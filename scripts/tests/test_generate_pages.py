@@ -0,0 +1,81 @@
+import gzip
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_pages  # noqa: E402
+
+
+def multi_series_spec(run_count, series_count):
+    rng = random.Random(run_count)
+    return {
+        "benchmark": "javalin.performance.Benchmarks.hello",
+        "scoreUnit": "ops/ms",
+        "runs": [{"runId": f"run-{idx}", "label": str(idx), "fullLabel": str(idx)} for idx in range(run_count)],
+        "series": [
+            {
+                "name": f"6.{series}.0",
+                "color": "#0f8b8d",
+                "data": [rng.uniform(10, 100) * (series + 1) if rng.random() > 0.1 else None for _ in range(run_count)],
+            }
+            for series in range(series_count)
+        ],
+    }
+
+
+class DownsampleChartDataTest(unittest.TestCase):
+    def test_caps_shared_run_axis_for_many_series(self):
+        for run_count in (320, 600, 1000):
+            spec = multi_series_spec(run_count, 15)
+            downsampled = generate_pages.downsample_chart_data({"hello": spec})["hello"]
+
+            self.assertLessEqual(len(downsampled["runs"]), generate_pages.CHART_MAX_POINTS)
+            self.assertEqual(downsampled["runs"][0], spec["runs"][0])
+            self.assertEqual(downsampled["runs"][-1], spec["runs"][-1])
+            for item in downsampled["series"]:
+                self.assertEqual(len(item["data"]), len(downsampled["runs"]))
+
+    def test_short_history_is_unchanged(self):
+        spec = multi_series_spec(generate_pages.CHART_MAX_POINTS, 15)
+        self.assertIs(generate_pages.downsample_chart_data({"hello": spec})["hello"], spec)
+
+
+class WriteReportGzipTest(unittest.TestCase):
+    def write_page(self, output_path):
+        spec = multi_series_spec(12, 3)
+        rows = generate_pages.summarize([])
+        ctx = generate_pages.PageContext(
+            repo="javalin/javalin-performance-tests-testing",
+            latest_run_id="run-11",
+            meta={},
+            runner={},
+            active_run_id=None,
+            root_rel=".",
+        )
+        body = generate_pages.render_page_body(rows, {"hello": spec})
+        generate_pages.write_report(ctx, output_path, body, [], gzip_copy=True)
+
+    def test_gzip_copy_matches_html(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / "index.html"
+            self.write_page(output_path)
+
+            gzip_path = Path(tmp) / "index.html.gz"
+            self.assertEqual(gzip.decompress(gzip_path.read_bytes()), output_path.read_bytes())
+
+    def test_gzip_header_has_no_timestamp(self):
+        # The page itself carries the generation time; the gzip header must not add one.
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / "index.html"
+            self.write_page(output_path)
+
+            header = (Path(tmp) / "index.html.gz").read_bytes()[:10]
+            self.assertEqual(header[4:8], bytes(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
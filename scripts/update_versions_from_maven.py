@@ -1,36 +1,112 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import functools
+import hashlib
+import io
+import itertools
 import json
+import operator
+import os
 import re
+import sys
+import time
+import urllib.error
 import urllib.request
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 METADATA_URL = "https://repo1.maven.org/maven2/io/javalin/javalin/maven-metadata.xml"
 SNAPSHOT_METADATA_URL = "https://maven.reposilite.com/snapshots/io/javalin/javalin/maven-metadata.xml"
+MAVEN_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "maven"
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)(?:[.-]?([A-Za-z].*))?")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def load_cache_entry(meta_path: Path, body_path: Path) -> Optional[dict]:
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or not body_path.is_file():
+        return None
+    # A hand-edited or corrupted entry is treated like a missing one.
+    if not isinstance(meta.get("fetchedAt"), (int, float)):
+        return None
+    if any(not isinstance(meta.get(key), (str, type(None))) for key in ("etag", "lastModified")):
+        return None
+    return meta
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def save_cache_entry(meta_path: Path, body_path: Path, meta: dict, body: Optional[bytes]) -> None:
+    try:
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        if body is not None:
+            write_atomic(body_path, body)
+        write_atomic(meta_path, json.dumps(meta).encode())
+    except OSError:
+        pass
 
 
 def fetch_xml(url: str) -> bytes:
-    request = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": "javalin-performance-tests-version-resolver/1.0",
-            "Accept": "application/xml,text/xml,*/*",
-        },
-    )
-    with urllib.request.urlopen(request, timeout=30) as response:
-        return response.read()
-
-
+    # Responses are cached on disk for local runs and always revalidated with a
+    # conditional GET, so an unchanged file is not downloaded again.
+    cache_key = hashlib.sha1(url.encode()).hexdigest()
+    meta_path = MAVEN_CACHE_DIR / f"{cache_key}.json"
+    body_path = MAVEN_CACHE_DIR / f"{cache_key}.xml"
+    cached = load_cache_entry(meta_path, body_path)
+    now = time.time()
+
+    headers = {
+        "User-Agent": "javalin-performance-tests-version-resolver/1.0",
+        "Accept": "application/xml,text/xml,*/*",
+    }
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("lastModified"):
+            headers["If-Modified-Since"] = cached["lastModified"]
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            body = response.read()
+            meta = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "lastModified": response.headers.get("Last-Modified"),
+                "fetchedAt": now,
+            }
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304 or cached is None:
+            raise
+        save_cache_entry(meta_path, body_path, {**cached, "fetchedAt": now}, None)
+        return body_path.read_bytes()
+
+    save_cache_entry(meta_path, body_path, meta, body)
+    return body
+
+
+@functools.lru_cache(maxsize=None)
 def parse_version(version: str) -> Tuple[int, int, int, str]:
-    match = re.fullmatch(r"(\d+)\.(\d+)\.(\d+)(?:[.-]?([A-Za-z].*))?", version)
+    # Plain x.y.z releases are split directly; only suffixed versions need the regex.
+    parts = version.split(".")
+    if len(parts) == 3 and all(part.isdecimal() for part in parts):
+        return int(parts[0]), int(parts[1]), int(parts[2]), ""
+    match = VERSION_PATTERN.fullmatch(version)
     if not match:
         raise ValueError(f"Unsupported version format: {version}")
     major, minor, patch, suffix = match.groups()
     return int(major), int(minor), int(patch), suffix or ""
 
 
+@functools.lru_cache(maxsize=None)
 def parse_prerelease_suffix(suffix: str) -> Tuple[int, int, str]:
     normalized = suffix.lower()
     snapshot = "-snapshot" in normalized or normalized.endswith("snapshot")
@@ -45,8 +121,8 @@ def parse_prerelease_suffix(suffix: str) -> Tuple[int, int, str]:
     else:
         stage = 3
 
-    number_match = re.search(r"(\d+)", cleaned)
-    stage_number = int(number_match.group(1)) if number_match else -1
+    number_match = NUMBER_PATTERN.search(cleaned)
+    stage_number = int(number_match.group()) if number_match else -1
 
     # Snapshot variants should sort after their base prerelease stage when comparing.
     snapshot_rank = 1 if snapshot else 0
@@ -54,7 +130,8 @@ def parse_prerelease_suffix(suffix: str) -> Tuple[int, int, str]:
 
 
 def is_stable(version: str) -> bool:
-    return bool(re.fullmatch(r"\d+\.\d+\.\d+", version))
+    parts = version.split(".")
+    return len(parts) == 3 and all(part.isdecimal() for part in parts)
 
 
 def stable_tuple(version: str) -> Tuple[int, int, int]:
@@ -64,13 +141,7 @@ def stable_tuple(version: str) -> Tuple[int, int, int]:
     return major, minor, patch
 
 
-def prerelease_base_tuple(version: str) -> Tuple[int, int, int]:
-    major, minor, patch, suffix = parse_version(version)
-    if not suffix:
-        raise ValueError(f"Not a prerelease version: {version}")
-    return major, minor, patch
-
-
+@functools.lru_cache(maxsize=None)
 def version_sort_key(version: str):
     major, minor, patch, suffix = parse_version(version)
     stability_rank = 1 if suffix == "" else 0
@@ -84,16 +155,23 @@ def parse_minimum(value: str) -> Tuple[int, int, int]:
     return stable_tuple(value)
 
 
+def parse_metadata_versions(xml_data: bytes) -> List[str]:
+    # Only the <versions> list is needed, so the document is streamed and each list is
+    # dropped once read instead of keeping the whole tree.
+    versions = []
+    for _, element in ET.iterparse(io.BytesIO(xml_data)):
+        if element.tag == "versions":
+            versions.extend(child.text.strip() for child in element.findall("version") if child.text)
+            element.clear()
+    return versions
+
+
 def fetch_versions() -> List[str]:
-    xml_data = fetch_xml(METADATA_URL)
-    root = ET.fromstring(xml_data)
-    return [element.text.strip() for element in root.findall("./versioning/versions/version") if element.text]
+    return parse_metadata_versions(fetch_xml(METADATA_URL))
 
 
 def fetch_snapshot_versions() -> List[str]:
-    xml_data = fetch_xml(SNAPSHOT_METADATA_URL)
-    root = ET.fromstring(xml_data)
-    return [element.text.strip() for element in root.findall("./versioning/versions/version") if element.text]
+    return parse_metadata_versions(fetch_xml(SNAPSHOT_METADATA_URL))
 
 
 def select_versions(
@@ -104,76 +182,64 @@ def select_versions(
     include_latest_per_major: bool,
     include_prerelease_latest_major: bool,
     latest_prerelease_count: int,
-    include_latest_snapshot: bool,
+    snapshot_versions: List[str],
 ) -> List[str]:
-    stable_versions = [
-        version
-        for version in versions
-        if is_stable(version) and stable_tuple(version) >= minimum
-    ]
+    # Each version is parsed once; the stable entries are sorted by (major, minor, patch)
+    # so majors and minors can be grouped without further lookups.
+    parsed_all = []
+    for version in versions:
+        try:
+            parsed_all.append((parse_version(version), version))
+        except ValueError:
+            continue
 
-    if not stable_versions:
-        raise SystemExit("No stable versions matched filters")
+    stable_entries = sorted(
+        ((parsed[:3], version) for parsed, version in parsed_all if not parsed[3] and parsed[:3] >= minimum),
+        key=operator.itemgetter(0),
+    )
 
-    stable_by_major = {}
-    for version in stable_versions:
-        major = stable_tuple(version)[0]
-        stable_by_major.setdefault(major, []).append(version)
+    if not stable_entries:
+        raise SystemExit("No stable versions matched filters")
 
-    for major in stable_by_major:
-        stable_by_major[major].sort(key=stable_tuple)
+    stable_by_major = {
+        major: list(entries)
+        for major, entries in itertools.groupby(stable_entries, key=lambda entry: entry[0][0])
+    }
 
-    sorted_stable_majors = sorted(stable_by_major.keys())
+    sorted_stable_majors = list(stable_by_major)
     latest_major_slice = sorted_stable_majors[-max(include_all_latest_majors, 0):] if include_all_latest_majors > 0 else []
 
     selected = set()
 
     for major in latest_major_slice:
-        major_versions = stable_by_major[major]
+        major_entries = stable_by_major[major]
         if latest_minors_per_major > 0:
-            latest_patch_by_minor = {}
-            for version in major_versions:
-                _, minor, patch = stable_tuple(version)
-                current = latest_patch_by_minor.get(minor)
-                if current is None:
-                    latest_patch_by_minor[minor] = version
-                else:
-                    _, _, current_patch = stable_tuple(current)
-                    if patch > current_patch:
-                        latest_patch_by_minor[minor] = version
-            for minor in sorted(latest_patch_by_minor.keys())[-latest_minors_per_major:]:
-                selected.add(latest_patch_by_minor[minor])
+            latest_patch_by_minor = {minor: version for (_, minor, _), version in major_entries}
+            selected.update(list(latest_patch_by_minor.values())[-latest_minors_per_major:])
         else:
-            selected.update(major_versions)
+            selected.update(version for _, version in major_entries)
 
     if include_latest_per_major:
-        for major in sorted_stable_majors:
-            selected.add(stable_by_major[major][-1])
-
-    parsed_all = []
-    for version in versions:
-        try:
-            parsed_all.append((version, parse_version(version)))
-        except ValueError:
-            continue
+        for major_entries in stable_by_major.values():
+            selected.add(major_entries[-1][1])
 
     latest_major_seen = None
     if parsed_all:
-        latest_major_seen = max(parsed[0] for _, parsed in parsed_all)
+        latest_major_seen = max(parsed[0] for parsed, _ in parsed_all)
 
     if latest_major_seen is not None and (include_prerelease_latest_major or latest_prerelease_count > 0):
-        stable_bases = {stable_tuple(version) for version in stable_versions}
-        prereleases = [
-            version
-            for version, (major, _, _, suffix) in parsed_all
-            if major == latest_major_seen and suffix != "" and "snapshot" not in suffix.lower()
-        ]
-        prereleases = [
-            version
-            for version in prereleases
-            if prerelease_base_tuple(version) not in stable_bases
-        ]
-        prereleases = sorted(prereleases, key=version_sort_key)
+        stable_bases = {base for base, _ in stable_entries}
+        prereleases = sorted(
+            (
+                version
+                for (major, minor, patch, suffix), version in parsed_all
+                if major == latest_major_seen
+                and suffix != ""
+                and "snapshot" not in suffix.lower()
+                and (major, minor, patch) not in stable_bases
+            ),
+            key=version_sort_key,
+        )
 
         if include_prerelease_latest_major:
             selected.update(prereleases)
@@ -181,7 +247,7 @@ def select_versions(
             rc_candidates = [version for version in prereleases if "rc" in parse_version(version)[3].lower()]
             chosen: List[str] = []
             if rc_candidates:
-                chosen.extend(sorted(rc_candidates, key=version_sort_key)[-latest_prerelease_count:])
+                chosen.extend(rc_candidates[-latest_prerelease_count:])
             if len(chosen) < latest_prerelease_count:
                 for candidate in reversed(prereleases):
                     if candidate in chosen:
@@ -191,22 +257,17 @@ def select_versions(
                         break
             selected.update(chosen)
 
-    if include_latest_snapshot:
+    parsed_snapshots = []
+    for version in snapshot_versions:
+        if "snapshot" not in version.lower():
+            continue
         try:
-            snapshot_versions = fetch_snapshot_versions()
-        except Exception:
-            snapshot_versions = []
-        parsed_snapshots = []
-        for version in snapshot_versions:
-            if "snapshot" not in version.lower():
-                continue
-            try:
-                parse_version(version)
-                parsed_snapshots.append(version)
-            except ValueError:
-                continue
-        if parsed_snapshots:
-            selected.add(sorted(parsed_snapshots, key=version_sort_key)[-1])
+            parse_version(version)
+            parsed_snapshots.append(version)
+        except ValueError:
+            continue
+    if parsed_snapshots:
+        selected.add(max(parsed_snapshots, key=version_sort_key))
 
     return sorted(selected, key=version_sort_key)
 
@@ -301,7 +362,18 @@ def main():
     minimum = parse_minimum(args.minimum)
     include_latest_per_major = not args.no_include_latest_per_major
 
-    versions = fetch_versions()
+    snapshot_versions: List[str] = []
+    if args.include_latest_snapshot:
+        # The two metadata files come from different hosts, so they are fetched concurrently.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            snapshot_future = executor.submit(fetch_snapshot_versions)
+            versions = fetch_versions()
+            try:
+                snapshot_versions = snapshot_future.result()
+            except Exception:
+                snapshot_versions = []
+    else:
+        versions = fetch_versions()
     selected = select_versions(
         versions=versions,
         minimum=minimum,
@@ -310,7 +382,7 @@ def main():
         include_latest_per_major=include_latest_per_major,
         include_prerelease_latest_major=args.include_prerelease_latest_major,
         latest_prerelease_count=args.latest_prerelease_count,
-        include_latest_snapshot=args.include_latest_snapshot,
+        snapshot_versions=snapshot_versions,
     )
 
     header = build_header(
@@ -325,10 +397,18 @@ def main():
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join([*header, *selected, ""]))
+    content = "".join(f"{line}\n" for line in itertools.chain(header, selected))
+    # Leave an unchanged file untouched so its mtime does not invalidate anything keyed on it.
+    try:
+        unchanged = output_path.read_text() == content
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        output_path.write_text(content)
 
     if args.json:
-        print(json.dumps(selected))
+        json.dump(selected, sys.stdout)
+        sys.stdout.write("\n")
     else:
         print(f"Wrote {len(selected)} versions to {output_path}")
 
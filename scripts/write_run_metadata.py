@@ -69,7 +69,9 @@ def main():
 
     output = Path(args.output)
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(payload, indent=2) + "\n")
+    with output.open("w") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
 
 
 if __name__ == "__main__":